@@ -0,0 +1,261 @@
+"""
+UIDAI Aadhaar Aggregates API
+Serves the dashboard numbers as JSON from the same precomputed artifacts
+UIDAI Data Hackathon 2026
+
+Endpoints (GET, JSON):
+    /api/health                                  data versions and uptime
+    /api/states?dataset=&start=&end=             state totals for a date range
+    /api/age-split?state=&start=&end=            age bucket totals per dataset
+    /api/forecasts                               30-day forecasts and daily averages
+    /api/anomalies?rate=                         flagged record counts by dataset and state
+                                                 (rate = flag rate in %, re-thresholded without a refit)
+
+Dates are ISO (YYYY-MM-DD) and default to the full period. Every data response carries
+an ETag derived from the request and the versions of the artifacts it reads, so clients
+sending If-None-Match get a 304 until the underlying files change. /api/health is
+computed fresh on every request (no ETag, never cached).
+
+Latency budget (localhost, measured by bench_api.py):
+    p95 <=  5 ms   revalidation (304 Not Modified)
+    p95 <= 10 ms   cached response (in-process LRU hit)
+    p95 <= 50 ms   uncached response (prefix-sum lookups over the indexes)
+
+Run: python api_server.py [--host 127.0.0.1] [--port 8502]
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+import data_store
+
+LATENCY_BUDGET_MS = {
+    'revalidate': 5,
+    'cached': 10,
+    'uncached': 50
+}
+
+LRU_SIZE = 512
+
+DATASETS = list(data_store.DATA_FILES)
+
+# ============================================================
+# RESPONSE CACHE
+# ============================================================
+
+class LRUCache:
+    """Small thread-safe LRU of encoded responses, keyed by ETag"""
+
+    def __init__(self, size=LRU_SIZE):
+        self.size = size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+# ============================================================
+# ENDPOINTS
+# ============================================================
+
+ENDPOINTS = {}
+
+def endpoint(path, deps, cache=True):
+    """Register a handler together with the artifacts its response depends on
+    (cache=False: always computed fresh - no ETag, never stored in the LRU)"""
+    def register(func):
+        ENDPOINTS[path] = (func, deps, cache)
+        return func
+    return register
+
+def _date_range(data, params, name):
+    first, last = data_store.date_limits(data[f'{name}_index'])
+    start = datetime.date.fromisoformat(params['start']) if 'start' in params else first
+    end = datetime.date.fromisoformat(params['end']) if 'end' in params else last
+    return start, end
+
+def _datasets(params):
+    if 'dataset' not in params:
+        return DATASETS
+    if params['dataset'] not in DATASETS:
+        raise ValueError(f"unknown dataset '{params['dataset']}'")
+    return [params['dataset']]
+
+@endpoint('/api/health', deps=[], cache=False)
+def health(data, versions, params):
+    return {
+        'status': 'ok',
+        'uptime_seconds': round(time.time() - STARTED_AT, 1),
+        'versions': {name: repr(version) for name, version in versions.items() if not name.endswith('_index')}
+    }
+
+@endpoint('/api/states', deps=[f'{name}_index' for name in DATASETS])
+def state_totals(data, versions, params):
+    result = {}
+    for name in _datasets(params):
+        start, end = _date_range(data, params, name)
+        totals = data_store.state_range_totals(data[f'{name}_index'], start, end)['total']
+        result[name] = {'start': start.isoformat(), 'end': end.isoformat(),
+                        'states': {state: int(total) for state, total in totals.sort_values(ascending=False).items()}}
+    return result
+
+@endpoint('/api/age-split', deps=[f'{name}_index' for name in DATASETS])
+def age_split(data, versions, params):
+    state = params.get('state', data_store.ALL_STATES)
+    result = {}
+    for name in _datasets(params):
+        start, end = _date_range(data, params, name)
+        totals = data_store.range_totals(data[f'{name}_index'], state, start, end)
+        result[name] = {'state': state, 'start': start.isoformat(), 'end': end.isoformat(),
+                        'totals': {col: int(value) for col, value in totals.items()}}
+    return result
+
+@endpoint('/api/forecasts', deps=['forecasts'])
+def forecasts(data, versions, params):
+    result = {}
+    for name in _datasets(params):
+        forecast = data['forecasts'][name]
+        result[name] = {
+            'daily_avg': float(forecast['forecast'].mean()),
+            'total': float(forecast['forecast'].sum()),
+            'days': [{'date': date.date().isoformat(), 'forecast': float(value)}
+                     for date, value in zip(forecast['date'], forecast['forecast'])]
+        }
+    return result
+
+@endpoint('/api/anomalies', deps=['anomaly_reports', 'anomaly_index', 'score_sketches'])
+def anomaly_counts(data, versions, params):
+    reports, index = data['anomaly_reports'], data['anomaly_index']
+    if 'rate' not in params:
+        counts = {name: len(report) for name, report in reports.items()}
+        return {
+            'total': sum(counts.values()),
+            'by_dataset': counts,
+            'by_state': {state: int(count) for state, count in index['state_counts'].items()}
+        }
+    
+    rate = float(params['rate']) / 100
+    coverage = data_store.report_coverage(reports, data['score_sketches'])
+    # The least-covered report sets the limit (as the dashboard slider does) - beyond it that
+    # dataset's whole report would be counted and the totals would fall short of the rate
+    max_rate = min(coverage.values())
+    if not 0 < rate <= max_rate:
+        raise ValueError(f"rate must be in (0, {max_rate * 100:.2f}] - not every report holds rows beyond that")
+    thresholds = data_store.rate_thresholds(reports, data['score_sketches'], rate)
+    counts = {name: int((report['anomaly_score'] >= thresholds[name]).sum()) for name, report in reports.items()}
+    floors = np.array([thresholds[name] for name in index['dataset_names']])
+    flagged = index['records'][index['scores'] >= floors[index['dataset_codes']]]
+    return {
+        'rate': rate * 100,
+        'thresholds': thresholds,
+        'coverage': {name: value * 100 for name, value in coverage.items()},
+        'total': sum(counts.values()),
+        'by_dataset': counts,
+        'by_state': {state: int(count) for state, count in flagged['state'].value_counts().items()}
+    }
+
+# ============================================================
+# HTTP SERVER
+# ============================================================
+
+class AggregatesHandler(BaseHTTPRequestHandler):
+    server_version = 'AadhaarAggregates/1.0'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = ENDPOINTS.get(url.path)
+        if route is None:
+            return self._send(404, self._error(f"unknown endpoint '{url.path}'"))
+
+        func, deps, cache = route
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        data, versions = self.server.store.snapshot()
+        if not cache:
+            try:
+                return self._send(200, json.dumps(func(data, versions, params)).encode())
+            except (ValueError, KeyError) as exc:
+                return self._send(400, self._error(str(exc)))
+
+        # ETag covers the request and only the artifacts this endpoint reads
+        key = repr((url.path, sorted(params.items()), [versions[dep] for dep in deps]))
+        etag = '"' + hashlib.sha1(key.encode()).hexdigest()[:24] + '"'
+        if self.headers.get('If-None-Match') == etag:
+            return self._send(304, None, etag)
+
+        body = self.server.cache.get(etag)
+        if body is None:
+            try:
+                body = json.dumps(func(data, versions, params)).encode()
+            except (ValueError, KeyError) as exc:
+                return self._send(400, self._error(str(exc)))
+            self.server.cache.put(etag, body)
+        self._send(200, body, etag)
+
+    def _error(self, message):
+        return json.dumps({'error': message}).encode()
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        if body is not None:
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if body is not None:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep the hot path quiet
+
+def make_server(host='127.0.0.1', port=8502, store=None):
+    """HTTP server bound to a live data store (started if not given)"""
+    server = ThreadingHTTPServer((host, port), AggregatesHandler)
+    server.store = store or data_store.LiveDataStore(data_store.dashboard_artifacts()).start()
+    server.cache = LRUCache()
+    return server
+
+STARTED_AT = time.time()
+
+def main():
+    parser = argparse.ArgumentParser(description='Aadhaar aggregates JSON API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8502)
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🌐 UIDAI AGGREGATES API")
+    print("="*60)
+    print("\n📂 Loading datasets and building indexes...")
+    server = make_server(args.host, args.port)
+    print(f"   ✅ Serving on http://{args.host}:{args.port}/api/health")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n   Stopped.")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+UIDAI Aggregates API Benchmark
+Measures localhost latency of api_server.py against its documented budget
+UIDAI Data Hackathon 2026
+
+Run: python api_server.py &  then  python bench_api.py [--url http://127.0.0.1:8502] [--requests 200]
+"""
+
+import argparse
+import datetime
+import json
+import random
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from api_server import LATENCY_BUDGET_MS
+
+ENDPOINTS = ['/api/states', '/api/age-split', '/api/forecasts', '/api/anomalies']
+
+def timed_get(url, etag=None):
+    """(milliseconds, status, etag, body) for one GET"""
+    request = urllib.request.Request(url, headers={'If-None-Match': etag} if etag else {})
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            body = response.read()
+            status, etag = response.status, response.headers.get('ETag')
+    except urllib.error.HTTPError as exc:
+        body, status, etag = b'', exc.code, exc.headers.get('ETag')
+    return (time.perf_counter() - started) * 1000, status, etag, body
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q / 100 * len(values)))]
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the aggregates API')
+    parser.add_argument('--url', default='http://127.0.0.1:8502')
+    parser.add_argument('--requests', type=int, default=200)
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("⏱️ AGGREGATES API BENCHMARK")
+    print("="*60)
+
+    _, status, _, body = timed_get(args.url + '/api/states?dataset=enrolment')
+    if status != 200:
+        sys.exit(f"❌ API not reachable at {args.url} (status {status})")
+    period = json.loads(body)['enrolment']
+    first = datetime.date.fromisoformat(period['start'])
+    span = (datetime.date.fromisoformat(period['end']) - first).days
+
+    timings = {'uncached': [], 'cached': [], 'revalidate': []}
+    for i in range(args.requests):
+        # Uncached: a fresh date range per request misses the LRU
+        start = first + datetime.timedelta(days=random.randint(0, span))
+        end = start + datetime.timedelta(days=random.randint(0, span))
+        path = random.choice(['/api/states', '/api/age-split'])
+        timings['uncached'].append(timed_get(f"{args.url}{path}?start={start}&end={end}&n={i}")[0])
+
+        url = args.url + ENDPOINTS[i % len(ENDPOINTS)]
+        elapsed, _, etag, _ = timed_get(url)
+        timings['cached'].append(elapsed)
+        elapsed, status, _, _ = timed_get(url, etag)
+        if status != 304:
+            sys.exit(f"❌ Expected 304 for {url}, got {status}")
+        timings['revalidate'].append(elapsed)
+
+    print(f"\n{'Kind':<12}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'budget':>10}")
+    over_budget = []
+    for kind, values in timings.items():
+        p95 = percentile(values, 95)
+        budget = LATENCY_BUDGET_MS[kind]
+        flag = '✅' if p95 <= budget else '❌'
+        print(f"{kind:<12}{percentile(values, 50):>10.2f}{p95:>10.2f}{max(values):>10.2f}{budget:>9} {flag}")
+        if p95 > budget:
+            over_budget.append(kind)
+
+    if over_budget:
+        print(f"\n❌ Over budget: {', '.join(over_budget)}")
+        sys.exit(1)
+    print("\n✅ All request kinds within the latency budget")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+UIDAI Map Geometry Builder
+Simplifies state and district boundary files once so the dashboard maps load fast
+UIDAI Data Hackathon 2026
+
+Input: full-resolution boundary GeoJSON (e.g. the DataMeet India state and district maps).
+Output (in data_store.GEO_DIR):
+    {level}_{detail}.geojson   one file per map level and simplification tolerance
+    region_codes.csv           integer code for every state and district
+Features carry their integer code as the GeoJSON id, which is what the dashboard joins on.
+
+Run: python build_geometries.py --states raw/states.geojson --districts raw/districts.geojson
+"""
+
+import argparse
+import json
+import math
+import os
+import numpy as np
+import pandas as pd
+
+import data_store
+
+# ============================================================
+# SIMPLIFICATION
+# ============================================================
+
+def simplify_ring(points, tolerance):
+    """Douglas-Peucker on one ring - keeps the points further than tolerance from the chord"""
+    if len(points) <= 4:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, chord = points[first], points[last] - points[first]
+        inner = points[first + 1:last] - start
+        length = np.hypot(*chord)
+        if length == 0:  # Closed ring - measure from the start point
+            dist = np.hypot(inner[:, 0], inner[:, 1])
+        else:
+            dist = np.abs(chord[0] * inner[:, 1] - chord[1] * inner[:, 0]) / length
+        i = int(dist.argmax())
+        if dist[i] > tolerance:
+            mid = first + 1 + i
+            keep[mid] = True
+            stack.extend([(first, mid), (mid, last)])
+    if keep.sum() < 4:  # A ring needs at least 4 points (closed triangle)
+        keep[[len(points) // 3, 2 * len(points) // 3]] = True
+    return points[keep]
+
+def simplify_geometry(geometry, tolerance, decimals):
+    """Simplify every ring of a Polygon / MultiPolygon and round the coordinates"""
+    polygons = [geometry['coordinates']] if geometry['type'] == 'Polygon' else geometry['coordinates']
+    simplified = [
+        [np.round(simplify_ring(np.asarray(ring, dtype=float), tolerance), decimals).tolist() for ring in polygon]
+        for polygon in polygons
+    ]
+    return {'type': 'MultiPolygon', 'coordinates': simplified}
+
+# ============================================================
+# REGION CODES
+# ============================================================
+
+def assign_codes(states, districts):
+    """Integer codes: states 1..N by name, districts 1..M by (state, district)"""
+    state_names = sorted(set(states), key=data_store.normalize_region)
+    district_names = sorted(set(districts), key=lambda sd: (data_store.normalize_region(sd[0]), data_store.normalize_region(sd[1])))
+    codes = pd.concat([
+        pd.DataFrame({'level': 'state', 'code': range(1, len(state_names) + 1), 'state': state_names, 'district': ''}),
+        pd.DataFrame({'level': 'district', 'code': range(1, len(district_names) + 1),
+                      'state': [s for s, _ in district_names], 'district': [d for _, d in district_names]})
+    ], ignore_index=True)
+    return codes
+
+# ============================================================
+# MAIN
+# ============================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Build simplified map geometries for the dashboard')
+    parser.add_argument('--states', required=True, help='State boundary GeoJSON')
+    parser.add_argument('--districts', required=True, help='District boundary GeoJSON')
+    parser.add_argument('--state-field', default='ST_NM', help='Property holding the state name')
+    parser.add_argument('--district-field', default='DISTRICT', help='Property holding the district name')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🗺️ BUILDING MAP GEOMETRIES")
+    print("="*60)
+
+    sources = {}
+    for level, path in (('state', args.states), ('district', args.districts)):
+        with open(path, encoding='utf-8') as f:
+            sources[level] = json.load(f)['features']
+        print(f"   📂 {level}: {len(sources[level])} features from {path}")
+
+    def feature_key(level, props):
+        state = props[args.state_field]
+        return state if level == 'state' else (state, props[args.district_field])
+
+    codes = assign_codes(
+        [feature_key('state', f['properties']) for f in sources['state']],
+        [feature_key('district', f['properties']) for f in sources['district']]
+    )
+    lookup = {
+        level: {(row.state if level == 'state' else (row.state, row.district)): row.code
+                for row in codes[codes['level'] == level].itertuples()}
+        for level in data_store.MAP_LEVELS
+    }
+
+    os.makedirs(data_store.GEO_DIR, exist_ok=True)
+    codes.to_csv(data_store.REGION_CODES_FILE, index=False)
+    print(f"   ✅ Saved {data_store.REGION_CODES_FILE} ({len(codes)} codes)")
+
+    for level in data_store.MAP_LEVELS:
+        for detail, tolerance in data_store.MAP_TOLERANCES.items():
+            # Keep one decimal more than the tolerance resolves - finer digits are noise
+            decimals = max(2, math.ceil(-math.log10(tolerance)) + 1)
+            features = []
+            for feature in sources[level]:
+                props = feature['properties']
+                key = feature_key(level, props)
+                features.append({
+                    'type': 'Feature',
+                    'id': int(lookup[level][key]),
+                    'properties': {'name': key if level == 'state' else key[1], 'state': props[args.state_field]},
+                    'geometry': simplify_geometry(feature['geometry'], tolerance, decimals)
+                })
+            path = data_store.geometry_path(level, detail)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump({'type': 'FeatureCollection', 'features': features}, f, separators=(',', ':'))
+            print(f"   ✅ {path}: {os.path.getsize(path) / 1024:,.0f} KB (tolerance {tolerance}°)")
+
+    print("\n✅ Map geometries ready - the dashboard picks them up on the next refresh")
+
+if __name__ == "__main__":
+    main()
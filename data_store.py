@@ -0,0 +1,580 @@
+"""
+UIDAI Aadhaar Dashboard Data Store
+Loads the cleaned datasets once and builds sorted indexes for fast filtering
+UIDAI Data Hackathon 2026
+"""
+
+import gzip
+import json
+import os
+import re
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+from ml_models import quantile_sketch
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+DATA_FILES = {
+    'enrolment': 'cleaned_data/aadhaar_enrolment_cleaned_v2.csv',
+    'biometric': 'cleaned_data/aadhaar_biometric_cleaned_v2.csv',
+    'demographic': 'cleaned_data/aadhaar_demographic_cleaned_v2.csv'
+}
+
+AGE_COLUMNS = {
+    'enrolment': ['age_0_5', 'age_5_17', 'age_18_greater'],
+    'biometric': ['bio_age_5_17', 'bio_age_17_'],
+    'demographic': ['demo_age_5_17', 'demo_age_17_']
+}
+
+ALL_STATES = 'All States'
+
+ONE_DAY = np.timedelta64(1, 'D')
+
+def file_version(paths):
+    """Cheap version key for a set of files (path, mtime, size)"""
+    version = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            version.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            version.append((path, None, None))
+    return tuple(version)
+
+def data_version():
+    """Version key of the cleaned datasets - changes whenever a file is rewritten"""
+    return file_version(DATA_FILES.values())
+
+def load_dataset(name):
+    """Load one cleaned dataset, add totals and sort it by date"""
+    df = pd.read_csv(DATA_FILES[name])
+    df['total'] = df[AGE_COLUMNS[name]].sum(axis=1)
+    df['date'] = pd.to_datetime(df['date'], dayfirst=True)
+
+    # Sort once so that every date filter is a binary search instead of a mask
+    df = df.sort_values('date', kind='stable').reset_index(drop=True)
+    return df
+
+# ============================================================
+# DATE RANGE INDEX
+# ============================================================
+
+def _prefix_sums(values):
+    """Cumulative sums with a leading zero row, so range sum = c[hi] - c[lo]"""
+    prefix = np.zeros((len(values) + 1, values.shape[1]), dtype=np.int64)
+    np.cumsum(values, axis=0, out=prefix[1:])
+    return prefix
+
+def value_index(values):
+    """Map each distinct value to the ascending row positions holding it"""
+    codes, uniques = pd.factorize(values, sort=True)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return {value: order[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)}
+
+def build_range_index(df, name):
+    """Build per-state row positions and daily prefix sums for a date-sorted frame"""
+    columns = AGE_COLUMNS[name] + ['total']
+    dates = df['date'].values
+
+    # Row positions per state - ascending, so each block is date-sorted as well
+    rows = value_index(df['state'])
+    states = pd.Index(list(rows))
+    row_dates = {state: dates[positions] for state, positions in rows.items()}
+
+    # Daily totals per state and nationwide, turned into prefix-sum arrays
+    daily = df.groupby(['state', 'date'], sort=True)[columns].sum()
+    daily_states = daily.index.get_level_values('state').values
+    day_bounds = np.append(np.searchsorted(daily_states, states.values), len(daily))
+    daily_dates = daily.index.get_level_values('date').values
+    daily_values = daily.to_numpy(dtype=np.int64)
+
+    days = {}
+    prefix = {}
+    for i, state in enumerate(states):
+        lo, hi = day_bounds[i], day_bounds[i + 1]
+        days[state] = daily_dates[lo:hi]
+        prefix[state] = _prefix_sums(daily_values[lo:hi])
+
+    national = df.groupby('date', sort=True)[columns].sum()
+    days[ALL_STATES] = national.index.values
+    prefix[ALL_STATES] = _prefix_sums(national.to_numpy(dtype=np.int64))
+
+    return {
+        'columns': columns,
+        'states': list(states),
+        'dates': dates,
+        'rows': rows,
+        'row_dates': row_dates,
+        'days': days,
+        'prefix': prefix
+    }
+
+def _bounds(sorted_dates, start, end):
+    """Positions of [start, end] (inclusive days) in a sorted datetime64 array"""
+    lo = np.searchsorted(sorted_dates, np.datetime64(start, 'ns'), side='left')
+    hi = np.searchsorted(sorted_dates, np.datetime64(end, 'ns') + ONE_DAY, side='left')
+    return lo, hi
+
+def date_limits(index):
+    """First and last date covered by an index"""
+    days = index['days'][ALL_STATES]
+    return pd.Timestamp(days[0]).date(), pd.Timestamp(days[-1]).date()
+
+def _selection(index, state, start, end):
+    """Filtered rows as a slice (all states) or an array of row positions (one state)"""
+    if state == ALL_STATES:
+        lo, hi = _bounds(index['dates'], start, end)
+        return slice(lo, hi)
+    if state not in index['rows']:
+        return slice(0, 0)
+    lo, hi = _bounds(index['row_dates'][state], start, end)
+    return index['rows'][state][lo:hi]
+
+def slice_rows(df, index, state, start, end):
+    """Rows of a date-sorted frame for a state and date range, without a full-frame mask"""
+    selection = _selection(index, state, start, end)
+    if isinstance(selection, slice):
+        return df.iloc[selection]
+    return df.take(selection)
+
+def count_rows(index, state, start, end):
+    """Number of rows a filter selects - binary searches only"""
+    selection = _selection(index, state, start, end)
+    if isinstance(selection, slice):
+        return selection.stop - selection.start
+    return len(selection)
+
+def range_totals(index, state, start, end):
+    """Age bucket and total sums for a state and date range - two prefix-sum lookups"""
+    if state not in index['prefix']:
+        return pd.Series(0, index=index['columns'], dtype=np.int64)
+    lo, hi = _bounds(index['days'][state], start, end)
+    prefix = index['prefix'][state]
+    return pd.Series(prefix[hi] - prefix[lo], index=index['columns'])
+
+def state_range_totals(index, start, end):
+    """Per-state totals for a date range, one prefix-sum lookup pair per state"""
+    totals = {state: range_totals(index, state, start, end) for state in index['states']}
+    return pd.DataFrame.from_dict(totals, orient='index', columns=index['columns'])
+
+# ============================================================
+# STREAMING EXPORT
+# ============================================================
+
+EXPORT_CHUNK_ROWS = 100000
+
+EXPORT_FORMATS = ['csv.gz'] + (['parquet'] if pq is not None else [])
+
+def iter_row_chunks(df, index, state, start, end, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Filtered rows in fixed-size chunks - the full selection is never materialized"""
+    selection = _selection(index, state, start, end)
+    if isinstance(selection, slice):
+        for lo in range(selection.start, selection.stop, chunk_rows):
+            yield df.iloc[lo:min(lo + chunk_rows, selection.stop)]
+    else:
+        for lo in range(0, len(selection), chunk_rows):
+            yield df.take(selection[lo:lo + chunk_rows])
+
+def export_chunks(chunks, path, fmt='csv.gz', on_chunk=None):
+    """Write chunks one at a time to a gzip CSV or Parquet file; returns rows written"""
+    rows = 0
+    if fmt == 'parquet':
+        if pq is None:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow)")
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema, compression='zstd')
+                writer.write_table(table)
+                rows += len(chunk)
+                if on_chunk:
+                    on_chunk(rows)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    with gzip.open(path, 'wt', newline='', compresslevel=6) as f:
+        for chunk in chunks:
+            chunk.to_csv(f, header=rows == 0, index=False, date_format='%d-%m-%Y')
+            rows += len(chunk)
+            if on_chunk:
+                on_chunk(rows)
+    return rows
+
+# ============================================================
+# REGION HIERARCHY (STATE -> DISTRICT -> PINCODE)
+# ============================================================
+
+REGION_LEVELS = ['state', 'district', 'pincode']
+
+def build_region_tree(frames):
+    """Precompute state -> district -> pincode rollups with children sorted by total"""
+    # Keyed by node path: () -> states, (state,) -> districts, (state, district) -> pincodes
+    names = list(frames)
+    leaves = pd.concat(
+        [df.groupby(REGION_LEVELS, sort=False)['total'].sum().rename(name) for name, df in frames.items()],
+        axis=1
+    ).fillna(0).astype(np.int64)
+    leaves['total'] = leaves[names].sum(axis=1)
+
+    tree = {}
+    for depth in range(len(REGION_LEVELS)):
+        keys = REGION_LEVELS[:depth + 1]
+        parents = keys[:-1]
+        if depth < len(REGION_LEVELS) - 1:
+            level = leaves.groupby(level=keys, sort=False).sum()
+        else:
+            level = leaves
+        level = level.reset_index().sort_values('total', ascending=False, kind='stable')
+        level = level.rename(columns={keys[-1]: 'name'})
+
+        if not parents:
+            tree[()] = level[['name'] + names + ['total']].reset_index(drop=True)
+            continue
+        for path, children in level.groupby(parents, sort=False):
+            path = path if isinstance(path, tuple) else (path,)
+            tree[path] = children[['name'] + names + ['total']].reset_index(drop=True)
+
+    return tree
+
+def region_children(tree, *path):
+    """Children of a node, pre-sorted by total - a dictionary lookup"""
+    return tree.get(tuple(path), tree[()].iloc[0:0])
+
+# ============================================================
+# MAP GEOMETRIES
+# ============================================================
+
+GEO_DIR = 'geometries'
+MAP_LEVELS = ['state', 'district']
+MAP_TOLERANCES = {'coarse': 0.05, 'medium': 0.01, 'fine': 0.002}  # Douglas-Peucker tolerance in degrees
+REGION_CODES_FILE = os.path.join(GEO_DIR, 'region_codes.csv')
+
+def geometry_path(level, detail):
+    return os.path.join(GEO_DIR, f'{level}_{detail}.geojson')
+
+def geometry_files():
+    return [REGION_CODES_FILE] + [geometry_path(level, detail) for level in MAP_LEVELS for detail in MAP_TOLERANCES]
+
+def normalize_region(name):
+    """Spelling-insensitive key for matching dataset names to boundary names"""
+    return re.sub(r'[^a-z0-9]', '', str(name).lower().replace('&', 'and'))
+
+def load_geometries():
+    """Pre-simplified GeoJSON per (level, detail) and the region code table - missing files are skipped"""
+    shapes = {}
+    for level in MAP_LEVELS:
+        for detail in MAP_TOLERANCES:
+            path = geometry_path(level, detail)
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    shapes[(level, detail)] = json.load(f)
+    codes = pd.read_csv(REGION_CODES_FILE, keep_default_na=False) if os.path.exists(REGION_CODES_FILE) else None
+    return {'shapes': shapes, 'codes': codes}
+
+def build_map_values(tree, geometries):
+    """Region totals per map level with the integer boundary code the map joins on"""
+    codes = geometries['codes']
+    if codes is None:
+        return {}
+    nodes = {
+        'state': tree[()].assign(state=tree[()]['name']),
+        'district': pd.concat([children.assign(state=path[0]) for path, children in tree.items() if len(path) == 1],
+                              ignore_index=True)
+    }
+
+    def join_key(states, districts=None):
+        key = states.map(normalize_region)
+        return key if districts is None else key + '|' + districts.map(normalize_region)
+
+    values = {}
+    for level in MAP_LEVELS:
+        table = codes[codes['level'] == level]
+        lookup = pd.Series(table['code'].to_numpy(),
+                           index=join_key(table['state'], table['district'] if level == 'district' else None))
+        lookup = lookup[~lookup.index.duplicated()]
+        level_nodes = nodes[level]
+        code = join_key(level_nodes['state'], level_nodes['name'] if level == 'district' else None).map(lookup)
+        values[level] = level_nodes[code.notna().to_numpy()].assign(code=code.dropna().astype(np.int64).to_numpy())
+        values[f'{level}_unmatched'] = int(code.isna().sum())
+    return values
+
+# ============================================================
+# ANOMALY EXPLORER INDEX
+# ============================================================
+
+ANOMALY_FILES = {
+    'enrolment': 'final_charts/ml_models/anomaly_reports/enrolment_anomalies_v2.csv',
+    'biometric': 'final_charts/ml_models/anomaly_reports/biometric_anomalies_v2.csv',
+    'demographic': 'final_charts/ml_models/anomaly_reports/demographic_anomalies_v2.csv'
+}
+
+ANOMALY_FILTERS = ['dataset', 'state', 'district']
+
+# Score distribution of every scored record, saved by master_analysis.py next to each report
+SCORE_SKETCH_FILES = {name: path.replace('_anomalies_v2.csv', '_scores_v2.json') for name, path in ANOMALY_FILES.items()}
+REPORT_RATE = 0.01  # Flag rate a report was written at when it has no score sketch
+
+def load_anomaly_reports():
+    """Load the flagged-record reports of all three datasets"""
+    return {name: pd.read_csv(path) for name, path in ANOMALY_FILES.items()}
+
+def load_score_sketches():
+    """Saved anomaly-score sketch per dataset (None for reports written without one)"""
+    return {name: quantile_sketch.load_sketch(path) if os.path.exists(path) else None
+            for name, path in SCORE_SKETCH_FILES.items()}
+
+def report_coverage(reports, sketches):
+    """Highest flag rate (fraction of all records) each report holds rows for"""
+    coverage = {}
+    for name, report in reports.items():
+        sketch = sketches.get(name)
+        if sketch is None or report.empty:
+            coverage[name] = REPORT_RATE
+        else:
+            coverage[name] = float(1 - quantile_sketch.sketch_cdf(sketch, report['anomaly_score'].min()))
+    return coverage
+
+def rate_thresholds(reports, sketches, rate):
+    """Lowest anomaly score still flagged per dataset at a flag rate - no refit, a sketch lookup"""
+    thresholds = {}
+    for name, report in reports.items():
+        sketch = sketches.get(name)
+        if sketch is not None:
+            thresholds[name] = float(quantile_sketch.sketch_quantile(sketch, 1 - rate))
+        else:
+            # The report is the top REPORT_RATE of the records - keep the same share of its rows
+            keep = int(np.ceil(len(report) * min(rate / REPORT_RATE, 1)))
+            scores = np.sort(report['anomaly_score'].to_numpy())[::-1]
+            thresholds[name] = float(scores[keep - 1]) if keep else np.inf
+    return thresholds
+
+def build_anomaly_index(frames):
+    """Sort all flagged records by anomaly score once and index the filter columns"""
+    anomalies = pd.concat([df.assign(dataset=name) for name, df in frames.items()], ignore_index=True)
+    anomalies['date'] = pd.to_datetime(anomalies['date'], dayfirst=True, format='mixed')
+    anomalies = anomalies.sort_values('anomaly_score', ascending=False, kind='stable').reset_index(drop=True)
+    dataset_codes, dataset_names = pd.factorize(anomalies['dataset'])
+
+    return {
+        'records': anomalies,
+        'dates': anomalies['date'].values,
+        'scores': anomalies['anomaly_score'].to_numpy(),
+        'dataset_codes': dataset_codes,
+        'dataset_names': list(dataset_names),
+        'columns': {col: value_index(anomalies[col]) for col in ANOMALY_FILTERS},
+        'state_counts': anomalies['state'].value_counts(),
+        'districts': {state: sorted(group.unique()) for state, group in anomalies.groupby('state')['district']}
+    }
+
+def query_anomalies(index, filters=None, start=None, end=None, page=0, page_size=50, ascending=False, min_scores=None):
+    """One page of flagged records, filtered through the column indexes
+
+    Returns the page and the number of matching records. Candidate positions come
+    from intersecting per-column position arrays; only the returned rows are read.
+    min_scores ({dataset: score}) re-derives the flags at another threshold.
+    """
+    candidates = None
+    for col, value in (filters or {}).items():
+        positions = index['columns'][col].get(value, np.empty(0, dtype=np.intp))
+        candidates = positions if candidates is None else np.intersect1d(candidates, positions, assume_unique=True)
+
+    if min_scores is not None:
+        floors = np.array([min_scores.get(name, -np.inf) for name in index['dataset_names']])
+        rows = slice(None) if candidates is None else candidates
+        keep = index['scores'][rows] >= floors[index['dataset_codes'][rows]]
+        candidates = np.flatnonzero(keep) if candidates is None else candidates[keep]
+
+    if start is not None or end is not None:
+        dates = index['dates'] if candidates is None else index['dates'][candidates]
+        keep = np.ones(len(dates), dtype=bool)
+        if start is not None:
+            keep &= dates >= np.datetime64(start, 'ns')
+        if end is not None:
+            keep &= dates < np.datetime64(end, 'ns') + ONE_DAY
+        candidates = np.flatnonzero(keep) if candidates is None else candidates[keep]
+
+    total = len(index['records']) if candidates is None else len(candidates)
+
+    # Positions are in descending score order already; ascending reads from the end
+    lo = page * page_size
+    hi = min(lo + page_size, total)
+    if lo >= total:
+        return index['records'].iloc[0:0], total
+    if ascending:
+        lo, hi = total - hi, total - lo
+    if candidates is None:
+        rows = index['records'].iloc[lo:hi]
+    else:
+        rows = index['records'].take(candidates[lo:hi])
+    return (rows.iloc[::-1] if ascending else rows), total
+
+INCIDENT_FILE = 'final_charts/ml_models/anomaly_reports/incidents_v2.csv'
+
+def load_incidents():
+    """District x day / week incidents ranked by combined score - None until ml_models/incidents.py has run"""
+    if not os.path.exists(INCIDENT_FILE):
+        return None
+    return pd.read_csv(INCIDENT_FILE, parse_dates=['start', 'end'])
+
+# ============================================================
+# RESOURCE ALLOCATION (FORECAST-DRIVEN)
+# ============================================================
+
+FORECAST_FILES = {
+    'enrolment': 'final_charts/ml_models/predictions/enrolment_forecast_v2.csv',
+    'biometric': 'final_charts/ml_models/predictions/biometric_forecast_v2.csv',
+    'demographic': 'final_charts/ml_models/predictions/demographic_forecast_v2.csv'
+}
+
+def load_forecasts():
+    """Load the 30-day forecasts of all three datasets"""
+    forecasts = {}
+    for name, path in FORECAST_FILES.items():
+        forecast = pd.read_csv(path)
+        forecast['date'] = pd.to_datetime(forecast['date'])
+        forecasts[name] = forecast
+    return forecasts
+
+# Same window the demand forecaster uses for its state-wise predictions
+SHARE_WINDOW_DAYS = 30
+
+# Assumptions: 1 operator handles ~100 requests/day, 1 center serves ~500 requests/day
+OPERATOR_CAPACITY = 100
+CENTER_CAPACITY = 500
+OPERATOR_MONTHLY_SALARY = 25000
+CARD_BUFFER_DAYS = 5
+
+def build_allocation_table(indexes, forecasts):
+    """Resource allocation for all states at once from the 30-day demand forecasts"""
+    # Each state's share of the last 30 days splits the national forecast daily volume
+    daily = {}
+    for name, index in indexes.items():
+        last = date_limits(index)[1]
+        start = last - pd.Timedelta(days=SHARE_WINDOW_DAYS - 1)
+        recent = state_range_totals(index, start, last)['total']
+        share = recent / max(recent.sum(), 1)
+        daily[f'{name}_daily'] = share * forecasts[name]['forecast'].mean()
+
+    table = pd.DataFrame(daily).fillna(0)
+    table['daily_requests'] = table.sum(axis=1)
+    table['operators_needed'] = (table['daily_requests'] // OPERATOR_CAPACITY).astype(np.int64) + 1
+    table['centers_needed'] = (table['daily_requests'] // CENTER_CAPACITY).astype(np.int64) + 1
+    table['monthly_budget'] = table['operators_needed'] * OPERATOR_MONTHLY_SALARY
+    table['card_stock'] = (table['daily_requests'] * CARD_BUFFER_DAYS).astype(np.int64)
+
+    table.index.name = 'state'
+    return table.sort_values('daily_requests', ascending=False)
+
+# ============================================================
+# LIVE REFRESH
+# ============================================================
+
+REFRESH_INTERVAL_SECONDS = 30
+
+def dashboard_artifacts():
+    """Everything the dashboard derives from disk, listed in dependency order"""
+    names = list(DATA_FILES)
+    artifacts = {}
+    for name in names:
+        artifacts[name] = {'files': [DATA_FILES[name]], 'build': lambda name=name: load_dataset(name)}
+        artifacts[f'{name}_index'] = {'deps': [name], 'build': lambda df, name=name: build_range_index(df, name)}
+    artifacts['region_tree'] = {
+        'deps': names,
+        'build': lambda *frames: build_region_tree(dict(zip(names, frames)))
+    }
+    artifacts['geometries'] = {'files': geometry_files(), 'build': load_geometries}
+    artifacts['map_values'] = {'deps': ['region_tree', 'geometries'], 'build': build_map_values}
+    artifacts['anomaly_reports'] = {'files': list(ANOMALY_FILES.values()), 'build': load_anomaly_reports}
+    artifacts['anomaly_index'] = {'deps': ['anomaly_reports'], 'build': build_anomaly_index}
+    artifacts['score_sketches'] = {'files': list(SCORE_SKETCH_FILES.values()), 'build': load_score_sketches}
+    artifacts['incidents'] = {'files': [INCIDENT_FILE], 'build': load_incidents}
+    artifacts['forecasts'] = {'files': list(FORECAST_FILES.values()), 'build': load_forecasts}
+    artifacts['allocation'] = {
+        'deps': [f'{name}_index' for name in names] + ['forecasts'],
+        'build': lambda *deps: build_allocation_table(dict(zip(names, deps[:-1])), deps[-1])
+    }
+    return artifacts
+
+class LiveDataStore:
+    """Current snapshot of the dashboard artifacts, refreshed by a background file watcher
+
+    A snapshot is a (values, versions) pair. A refresh rebuilds only the artifacts whose
+    files changed plus their dependents, then swaps the whole pair in one assignment, so
+    readers always see a consistent snapshot and never wait for a reload.
+    """
+
+    def __init__(self, artifacts, interval=REFRESH_INTERVAL_SECONDS):
+        self.artifacts = artifacts
+        self.interval = interval
+        self._observed = self._file_versions()
+        self._snapshot = self._build(set(artifacts), {}, {}, self._observed)
+        self._thread = None
+        self.refreshed_at = time.time()
+
+    def _file_versions(self):
+        return {name: file_version(spec['files']) for name, spec in self.artifacts.items() if 'files' in spec}
+
+    def _build(self, stale, values, versions, file_versions):
+        values, versions = dict(values), dict(versions)
+        for name, spec in self.artifacts.items():
+            if name not in stale:
+                continue
+            deps = spec.get('deps', [])
+            values[name] = spec['build'](*[values[dep] for dep in deps])
+            versions[name] = file_versions[name] if 'files' in spec else tuple(versions[dep] for dep in deps)
+        return values, versions
+
+    def snapshot(self):
+        """Consistent (values, versions) pair - versions double as cache keys"""
+        return self._snapshot
+
+    def refresh(self):
+        """Reload changed files and rebuild their dependents; returns the rebuilt artifact names"""
+        values, versions = self._snapshot
+        observed = self._file_versions()
+
+        # Only pick up a change once it has been stable for two polls (file fully written)
+        changed = {name for name, version in observed.items()
+                   if version != versions[name] and version == self._observed.get(name)}
+        self._observed = observed
+        if not changed:
+            return set()
+
+        stale = set(changed)
+        for name, spec in self.artifacts.items():
+            if stale.intersection(spec.get('deps', [])):
+                stale.add(name)
+
+        try:
+            self._snapshot = self._build(stale, values, versions, observed)
+        except Exception as exc:
+            # Keep serving the previous snapshot; the next poll retries
+            print(f"   ⚠️ Refresh of {sorted(changed)} failed: {exc}")
+            return set()
+        self.refreshed_at = time.time()
+        print(f"   ✅ Refreshed: {', '.join(sorted(stale))}")
+        return stale
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            self.refresh()
+
+    def start(self):
+        """Start the background watcher thread (idempotent)"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name='data-refresh', daemon=True)
+            self._thread.start()
+        return self
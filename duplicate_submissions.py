@@ -0,0 +1,161 @@
+"""
+UIDAI Duplicate Submission Detector
+Finds the same (date, pincode, district, counts) record submitted in more than one source shard
+UIDAI Data Hackathon 2026
+
+One streaming pass per dataset: each shard is read in chunks, every row is reduced to
+a 64-bit content hash, and the shard keeps only its fingerprint index (unique hashes
+and how often each occurs). A chunk whose hashes are already in an earlier shard's
+index has its colliding rows kept as cluster examples, so no shard is ever re-read and
+no more than one chunk of raw rows is held at a time.
+
+State is left out of the content on purpose - the raw shards spell the same state
+several ways, which would hide a re-submitted batch.
+
+Run: python duplicate_submissions.py [--datasets enrolment,biometric] [--out duplicate_submissions.csv]
+"""
+
+import argparse
+import glob
+import os
+import time
+import numpy as np
+import pandas as pd
+
+SHARD_PATTERNS = {
+    'enrolment': 'datasets/api_data_aadhar_enrolment/*.csv',
+    'biometric': 'datasets/api_data_aadhar_biometric/*.csv',
+    'demographic': 'datasets/api_data_aadhar_demographic/*.csv'
+}
+
+CHUNK_ROWS = 250000
+KEY_COLUMNS = ['date', 'pincode', 'district']
+
+# ============================================================
+# FINGERPRINTS
+# ============================================================
+
+def count_columns(chunk):
+    """The count columns of a shard - everything numeric except the pincode"""
+    return [c for c in chunk.select_dtypes('number').columns if c != 'pincode']
+
+def content_hashes(chunk, counts):
+    """64-bit hash of each row's (date, pincode, district, counts) after trimming / case-folding the text"""
+    content = pd.DataFrame({
+        'date': chunk['date'].astype(str).str.strip(),
+        'pincode': pd.to_numeric(chunk['pincode'], errors='coerce').fillna(-1).astype(np.int64),
+        'district': chunk['district'].astype(str).str.strip().str.lower().str.replace(r'\s+', ' ', regex=True)
+    })
+    for col in counts:
+        content[col] = chunk[col].fillna(0).astype(np.int64)
+    return pd.util.hash_pandas_object(content, index=False).to_numpy()
+
+def scan_shards(files, chunk_rows=CHUNK_ROWS):
+    """Fingerprint index per shard (unique hashes + counts) and one example row per cross-shard collision"""
+    indexes = {}
+    seen = np.empty(0, dtype=np.uint64)  # Sorted union of the hashes of all finished shards
+    examples = {}
+    for path in files:
+        shard = os.path.basename(path)
+        parts = []
+        for chunk in pd.read_csv(path, chunksize=chunk_rows):
+            counts = count_columns(chunk)
+            hashes = content_hashes(chunk, counts)
+            parts.append(hashes)
+
+            # Rows already fingerprinted in an earlier shard - keep their content while it is in memory
+            pos = np.searchsorted(seen, hashes).clip(max=max(len(seen) - 1, 0))
+            hit = (seen[pos] == hashes) if len(seen) else np.zeros(len(hashes), dtype=bool)
+            for h, row in zip(hashes[hit], chunk.loc[hit, KEY_COLUMNS + counts].itertuples(index=False)):
+                examples.setdefault(h, row._asdict())
+
+        hashes, copies = np.unique(np.concatenate(parts) if parts else np.empty(0, dtype=np.uint64), return_counts=True)
+        indexes[shard] = (hashes, copies)
+        seen = np.union1d(seen, hashes)
+    return indexes, examples
+
+# ============================================================
+# COLLISION CLUSTERS
+# ============================================================
+
+def collision_clusters(dataset, indexes, examples):
+    """One row per content hash found in two or more shards, largest double count first"""
+    shards = list(indexes)
+    hashes = np.concatenate([indexes[s][0] for s in shards])
+    copies = np.concatenate([indexes[s][1] for s in shards])
+    shard_ids = np.concatenate([np.full(len(indexes[s][0]), i) for i, s in enumerate(shards)])
+
+    # Each hash is unique within its shard, so repeated hashes here are cross-shard collisions
+    order = np.argsort(hashes, kind='stable')
+    hashes, copies, shard_ids = hashes[order], copies[order], shard_ids[order]
+    starts = np.flatnonzero(np.r_[True, hashes[1:] != hashes[:-1]])
+    n_shards = np.diff(np.r_[starts, len(hashes)])
+    multi = n_shards >= 2
+    if not multi.any():
+        return pd.DataFrame(), pd.DataFrame(0, index=shards, columns=shards)
+
+    cluster = np.repeat(np.arange(len(starts)), n_shards)
+    keep = multi[cluster]
+    members = pd.DataFrame({'hash': hashes[keep], 'shard': np.array(shards)[shard_ids[keep]], 'copies': copies[keep]})
+    clusters = members.groupby('hash', sort=False).agg(
+        n_shards=('shard', 'size'), copies=('copies', 'sum'), shards=('shard', lambda s: ' | '.join(sorted(s))))
+
+    content = pd.DataFrame.from_dict({h: examples[h] for h in clusters.index if h in examples}, orient='index')
+    clusters = content.join(clusters, how='right')
+    counts = [c for c in content.columns if c not in KEY_COLUMNS]
+    record_total = clusters[counts].sum(axis=1) if counts else 0
+    clusters['extra_copies'] = clusters['copies'] - 1
+    clusters['extra_total'] = clusters['extra_copies'] * record_total
+    clusters.insert(0, 'dataset', dataset)
+    clusters = clusters.sort_values(['extra_total', 'copies'], ascending=False, kind='stable').reset_index(drop=True)
+
+    # Shard x shard overlap - records each pair shares (diagonal: the shard's records found in any other shard)
+    pairs = members.merge(members, on='hash')
+    overlap = pd.crosstab(pairs['shard_x'], pairs['shard_y']).reindex(index=shards, columns=shards, fill_value=0)
+    overlap.index.name = overlap.columns.name = None
+    return clusters, overlap
+
+def detect_duplicates(dataset, files, chunk_rows=CHUNK_ROWS):
+    """Scan one dataset's shards and print its collision summary"""
+    print(f"\n📂 {dataset}: {len(files)} shard(s)")
+    started = time.perf_counter()
+    indexes, examples = scan_shards(files, chunk_rows)
+    clusters, overlap = collision_clusters(dataset, indexes, examples)
+    elapsed = time.perf_counter() - started
+
+    rows = sum(int(copies.sum()) for _, copies in indexes.values())
+    print(f"   ✅ {rows:,} records fingerprinted in {elapsed:.2f}s")
+    if clusters.empty:
+        print("   ✅ No record appears in more than one shard")
+        return clusters
+    print(f"   ⚠️ {len(clusters):,} records appear in 2+ shards - {int(clusters['extra_copies'].sum()):,} extra copies "
+          f"adding {int(clusters['extra_total'].sum()):,} to the counts")
+    print("\n   Shared records between shards (diagonal: found in any other shard):")
+    print("   " + overlap.to_string().replace('\n', '\n   '))
+    return clusters
+
+def main():
+    parser = argparse.ArgumentParser(description='Cross-shard duplicate submission detector')
+    parser.add_argument('--datasets', default=','.join(SHARD_PATTERNS), help='Comma-separated datasets to scan')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help='Rows read per chunk')
+    parser.add_argument('--out', default='duplicate_submissions.csv', help='Collision cluster report')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🧬 UIDAI DUPLICATE SUBMISSION DETECTOR")
+    print("="*60)
+
+    reports = []
+    for dataset in args.datasets.split(','):
+        files = sorted(glob.glob(SHARD_PATTERNS[dataset.strip()]))
+        if not files:
+            print(f"\n   ⚠️ {dataset}: no shards found at {SHARD_PATTERNS[dataset.strip()]}")
+            continue
+        reports.append(detect_duplicates(dataset.strip(), files, args.chunk_rows))
+
+    report = pd.concat(reports, ignore_index=True) if reports else pd.DataFrame()
+    report.to_csv(args.out, index=False)
+    print(f"\n   ✅ Saved: {args.out} ({len(report):,} collision clusters)")
+
+if __name__ == "__main__":
+    main()
@@ -10,9 +10,11 @@ import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
+import argparse
 import pickle
 import os
 import warnings
+from ml_models import model_store, quantile_sketch
 warnings.filterwarnings('ignore')
 
 # Professional styling
@@ -44,13 +46,25 @@ def add_value_labels(ax, bars):
                     xytext=(0, 3), textcoords="offset points",
                     ha='center', va='bottom', fontsize=10, fontweight='bold')
 
+CLEANED_FILES = {
+    'enrolment': 'cleaned_data/aadhaar_enrolment_cleaned_v2.csv',
+    'biometric': 'cleaned_data/aadhaar_biometric_cleaned_v2.csv',
+    'demographic': 'cleaned_data/aadhaar_demographic_cleaned_v2.csv'
+}
+
+AGE_COLUMNS = {
+    'enrolment': ['age_0_5', 'age_5_17', 'age_18_greater'],
+    'biometric': ['bio_age_5_17', 'bio_age_17_'],
+    'demographic': ['demo_age_5_17', 'demo_age_17_']
+}
+
 def load_cleaned_data():
     """Load all cleaned datasets"""
     print("\n📂 Loading cleaned datasets...")
     
-    enrol = pd.read_csv('cleaned_data/aadhaar_enrolment_cleaned_v2.csv')
-    bio = pd.read_csv('cleaned_data/aadhaar_biometric_cleaned_v2.csv')
-    demo = pd.read_csv('cleaned_data/aadhaar_demographic_cleaned_v2.csv')
+    enrol = pd.read_csv(CLEANED_FILES['enrolment'])
+    bio = pd.read_csv(CLEANED_FILES['biometric'])
+    demo = pd.read_csv(CLEANED_FILES['demographic'])
     
     # Create totals
     enrol['total'] = enrol['age_0_5'] + enrol['age_5_17'] + enrol['age_18_greater']
@@ -382,29 +396,50 @@ def generate_comparison_charts(enrol, bio, demo, output_dir):
 # ML MODELS
 # ============================================================
 
-def run_anomaly_detection(enrol, bio, demo, output_dir):
-    """Run anomaly detection on all datasets"""
+def run_anomaly_detection(enrol, bio, demo, output_dir, refit=True, contamination=None):
+    """Run anomaly detection on all datasets (refit=False scores with the saved models)
+
+    The score distribution is saved as a sketch with each model and next to each report,
+    so a new contamination with refit=False re-derives the flags without refitting.
+    """
     print("\n🔍 Running Anomaly Detection...")
     os.makedirs(output_dir, exist_ok=True)
     os.makedirs(f'{output_dir}/anomaly_reports', exist_ok=True)
+    model_dir = f'{output_dir}/trained_models/anomaly'
     
     results = {}
     
     for name, df in [('enrolment', enrol), ('biometric', bio), ('demographic', demo)]:
         df = df.copy()
-        df['z_score'] = (df['total'] - df['total'].mean()) / df['total'].std()
-        
         features = ['total', 'z_score']
-        X = df[features].fillna(0)
         
-        scaler = StandardScaler()
-        X_scaled = scaler.fit_transform(X)
+        if not refit and model_store.list_versions(name, model_dir):
+            # Daily path - z-score against the training statistics, then one scoring pass
+            saved = model_store.load_model(name, root=model_dir)
+            reference = saved['reference']
+            df['z_score'] = (df['total'] - reference['mean']) / reference['std']
+            scores = model_store.decision_scores(saved, df[features].fillna(0))
+            score_sketch = reference.get('score_sketch')
+            print(f"   ♻️ {name}: scored with saved model {saved['meta']['version']}")
+        else:
+            reference = {'mean': df['total'].mean(), 'std': df['total'].std()}
+            df['z_score'] = (df['total'] - reference['mean']) / reference['std']
+            X = df[features].fillna(0)
+            
+            scaler = StandardScaler()
+            X_scaled = scaler.fit_transform(X)
+            
+            model = IsolationForest(contamination=contamination or 0.01, random_state=42, n_estimators=100)
+            model.fit(X_scaled)
+            scores = model.decision_function(X_scaled)
+            score_sketch = reference['score_sketch'] = quantile_sketch.build_sketch(-scores)
+            version = model_store.save_model(name, scaler, model, reference, features, root=model_dir, rows=len(df))
+            print(f"   💾 {name}: saved model {version}")
         
-        model = IsolationForest(contamination=0.01, random_state=42, n_estimators=100)
-        predictions = model.fit_predict(X_scaled)
-        
-        df['is_anomaly'] = (predictions == -1).astype(int)
-        df['anomaly_score'] = -model.decision_function(X_scaled)
+        df['is_anomaly'] = (scores < 0).astype(int)
+        df['anomaly_score'] = -scores
+        if not refit and contamination is not None and score_sketch is not None:
+            df['is_anomaly'] = model_store.flag_anomalies(df['anomaly_score'], score_sketch, contamination)
         
         n_anomalies = df['is_anomaly'].sum()
         results[name] = {'count': n_anomalies, 'rate': n_anomalies / len(df) * 100, 'df': df}
@@ -412,6 +447,8 @@ def run_anomaly_detection(enrol, bio, demo, output_dir):
         # Save anomalies
         anomalies = df[df['is_anomaly'] == 1][['date', 'state', 'district', 'total', 'anomaly_score']]
         anomalies.to_csv(f'{output_dir}/anomaly_reports/{name}_anomalies_v2.csv', index=False)
+        if score_sketch is not None:
+            quantile_sketch.save_sketch(score_sketch, f'{output_dir}/anomaly_reports/{name}_scores_v2.json')
         
         print(f"   ✅ {name}: {n_anomalies:,} anomalies ({n_anomalies/len(df)*100:.2f}%)")
     
@@ -459,6 +496,27 @@ def run_anomaly_detection(enrol, bio, demo, output_dir):
     
     return results
 
+def run_anomaly_detection_chunked(output_dir, chunk_rows=model_store.CHUNK_ROWS, sample_rows=model_store.SAMPLE_ROWS):
+    """Anomaly detection for files too large to load - sample fit, chunked scoring"""
+    print("\n🔍 Running Anomaly Detection (subsample fit, chunked scoring)...")
+    os.makedirs(f'{output_dir}/anomaly_reports', exist_ok=True)
+    
+    def z_score_features(chunk, reference):
+        chunk['z_score'] = (chunk['total'] - reference['mean']) / reference['std']
+        return chunk
+    
+    results = {}
+    for name in ['enrolment', 'biometric', 'demographic']:
+        results[name] = model_store.detect_chunked(
+            name, CLEANED_FILES[name], AGE_COLUMNS[name], z_score_features, ['total', 'z_score'],
+            f'{output_dir}/anomaly_reports/{name}_anomalies_v2.csv', ['date', 'state', 'district', 'total', 'anomaly_score'],
+            root=f'{output_dir}/trained_models/anomaly', chunk_rows=chunk_rows, sample_rows=sample_rows
+        )
+        quantile_sketch.save_sketch(results[name]['score_sketch'], f'{output_dir}/anomaly_reports/{name}_scores_v2.json')
+        print(f"   ✅ {name}: {results[name]['flagged']:,} anomalies ({results[name]['rate']:.2f}%) - fit on {results[name]['sample_rows']:,} rows")
+    
+    return results
+
 def run_demand_forecasting(enrol, bio, demo, output_dir):
     """Run demand forecasting for all datasets"""
     print("\n🔮 Running Demand Forecasting...")
@@ -519,6 +577,18 @@ def run_demand_forecasting(enrol, bio, demo, output_dir):
 # ============================================================
 
 def main():
+    parser = argparse.ArgumentParser(description='Regenerate all charts and ML outputs from the cleaned data')
+    parser.add_argument('--score-only', action='store_true', help='Score anomalies with the saved models instead of refitting')
+    parser.add_argument('--contamination', type=float, help='Flag rate (default 0.01); with --score-only it is applied to the saved score distribution, no refit')
+    parser.add_argument('--chunked', action='store_true', help='Only run anomaly detection, streaming the files in chunks (data larger than memory)')
+    parser.add_argument('--chunk-rows', type=int, default=model_store.CHUNK_ROWS)
+    parser.add_argument('--sample-rows', type=int, default=model_store.SAMPLE_ROWS)
+    args = parser.parse_args()
+    
+    if args.chunked:
+        run_anomaly_detection_chunked('final_charts/ml_models', args.chunk_rows, args.sample_rows)
+        return
+    
     print("\n" + "="*70)
     print("🚀 MASTER ANALYSIS - REGENERATING ALL WITH CLEANED DATA")
     print("="*70)
@@ -533,7 +603,8 @@ def main():
     generate_comparison_charts(enrol, bio, demo, 'final_charts/comparison')
     
     # Run ML models
-    run_anomaly_detection(enrol, bio, demo, 'final_charts/ml_models')
+    run_anomaly_detection(enrol, bio, demo, 'final_charts/ml_models', refit=not args.score_only,
+                          contamination=args.contamination)
     run_demand_forecasting(enrol, bio, demo, 'final_charts/ml_models')
     
     print("\n" + "="*70)
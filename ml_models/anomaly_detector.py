@@ -10,8 +10,16 @@ import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
+import argparse
+import os
 import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import warnings
+import calendar_features
+import model_store
+import quantile_sketch
+import running_stats
 warnings.filterwarnings('ignore')
 
 # Professional styling
@@ -19,6 +27,33 @@ plt.style.use('seaborn-v0_8-whitegrid')
 plt.rcParams['font.family'] = 'sans-serif'
 plt.rcParams['axes.titleweight'] = 'bold'
 
+DATA_PATHS = {
+    'enrolment': '../../Bharat/aadhaar_enrolment_cleaned.csv',
+    'biometric': '../../Venkat/clean_aadhaar_biometric.csv',
+    'demographic': '../demographic_analysis/clean_aadhaar_demographic.csv'
+}
+
+TOTAL_COLUMNS = {
+    'enrolment': ['age_0_5', 'age_5_17', 'age_18_greater'],
+    'biometric': ['bio_age_5_17', 'bio_age_17_'],
+    'demographic': ['demo_age_5_17', 'demo_age_17_']
+}
+
+FEATURES = ['total', 'z_score', 'state_deviation', 'district_deviation', 'dow_deviation', 'month_edge_deviation']
+NEIGHBOUR_FEATURES = ['neighbour_deviation', 'pincode_neighbour_deviation']  # Optional (--neighbours)
+
+NEIGHBOUR_WINDOW = 3  # Numerically adjacent pincodes compared on each side, within the same district
+
+REPORT_COLUMNS = ['date', 'state', 'district', 'pincode', 'total', 'anomaly_score']
+
+ENGINES = ['forest', 'robust']
+ROBUST_Z = 3.5      # Iglewicz-Hoaglin cut-off for the modified z-score
+ROBUST_LEVELS = ['state', 'district']
+
+MIN_SEGMENT_ROWS = 20000  # States below this share one pooled model
+POOLED_SEGMENT = 'Small states (pooled)'
+SEGMENT_FIT_ROWS = 25600  # 100 trees x 256 samples - a forest never looks at more than this
+
 COLORS = {
     'normal': '#2E86AB',
     'anomaly': '#E63946',
@@ -37,46 +72,123 @@ def load_all_data():
     print("📂 Loading all datasets...")
     
     # Load enrolment data
-    enrol_df = pd.read_csv('../../Bharat/aadhaar_enrolment_cleaned.csv')
+    enrol_df = pd.read_csv(DATA_PATHS['enrolment'])
     enrol_df['total'] = enrol_df['age_0_5'] + enrol_df['age_5_17'] + enrol_df['age_18_greater']
     enrol_df['type'] = 'enrolment'
     
     # Load biometric data
-    bio_df = pd.read_csv('../../Venkat/clean_aadhaar_biometric.csv')
+    bio_df = pd.read_csv(DATA_PATHS['biometric'])
     bio_df['total'] = bio_df['bio_age_5_17'] + bio_df['bio_age_17_']
     bio_df['type'] = 'biometric'
     
     # Load demographic data
-    demo_df = pd.read_csv('../demographic_analysis/clean_aadhaar_demographic.csv')
+    demo_df = pd.read_csv(DATA_PATHS['demographic'])
     demo_df['total'] = demo_df['demo_age_5_17'] + demo_df['demo_age_17_']
     demo_df['type'] = 'demographic'
     
     return enrol_df, bio_df, demo_df
 
-def create_anomaly_features(df, update_type='generic'):
-    """Create features for anomaly detection"""
+def feature_reference(df):
+    """Statistics the features are measured against - saved with the model"""
+    return running_stats.store_reference(running_stats.build_store(df))
+
+def neighbour_baselines(pincode_means, window=NEIGHBOUR_WINDOW):
+    """Sorted pincode means and the mean of their adjacent pincodes (up to window each side, same district, self excluded)"""
+    means = pincode_means.sort_index()
+    values = means.to_numpy(dtype=float)
+    district = pd.factorize(means.index.get_level_values(0))[0]
+    position = np.arange(len(values))
+    
+    # First / last position of each row's district in the sorted arrays - the window is clipped to them
+    first = np.r_[True, district[1:] != district[:-1]]
+    last = np.r_[district[1:] != district[:-1], True]
+    starts = np.maximum.accumulate(np.where(first, position, 0))
+    ends = np.minimum.accumulate(np.where(last, position, len(values))[::-1])[::-1]
+    lo = np.maximum(position - window, starts)
+    hi = np.minimum(position + window, ends)
+    
+    # Centred rolling sum from one cumulative sum - O(pincodes) whatever the window
+    cumulative = np.r_[0.0, np.cumsum(values)]
+    neighbours = hi - lo
+    sums = cumulative[hi + 1] - cumulative[lo] - values
+    return means, pd.Series(np.where(neighbours > 0, sums / np.fmax(neighbours, 1), np.nan), index=means.index)
+
+def add_neighbour_columns(df, reference, district_means):
+    """Row and pincode volume against the pincode's numerical neighbours in the same district"""
+    pincode_means = reference.get('pincode_means')
+    if pincode_means is None or not len(pincode_means):
+        # References saved before the pincode level existed - measure against the batch itself
+        pincode_means = df.groupby(['district', 'pincode'])['total'].mean()
+    means, baselines = neighbour_baselines(pincode_means)
+    
+    # (district, pincode) as one int64 key - a hash lookup per row, no tuple index
+    districts = pd.Index(means.index.get_level_values(0).unique())
+    keys = pd.Index(districts.get_indexer(means.index.get_level_values(0)) * 1_000_000
+                    + means.index.get_level_values(1).to_numpy(dtype=np.int64))
+    row_district = districts.get_indexer(df['district'])
+    row_pincode = pd.to_numeric(df['pincode'], errors='coerce').fillna(-1).to_numpy(dtype=np.int64)
+    rows = keys.get_indexer(row_district * 1_000_000 + row_pincode)
+    known = (rows >= 0) & (row_district >= 0) & (row_pincode >= 0)
+    
+    # Unseen pincodes and single-pincode districts fall back to the district mean
+    neighbour = pd.Series(np.where(known, baselines.to_numpy()[rows], np.nan), index=df.index).fillna(district_means)
+    pincode = pd.Series(np.where(known, means.to_numpy()[rows], np.nan), index=df.index).fillna(neighbour)
+    df['neighbour_deviation'] = (df['total'] - neighbour) / neighbour.clip(lower=1)
+    df['pincode_neighbour_deviation'] = (pincode - neighbour) / neighbour.clip(lower=1)
+
+def calendar_baseline(df, means, column, slots, district_means):
+    """District mean for the row's calendar slot (weekday / month edge) - the district mean if unseen"""
+    if means is None or not len(means):
+        return district_means
+    # District x slot grid; rows look their cell up by position instead of a tuple hash
+    grid = means.unstack().reindex(columns=range(slots))
+    rows = grid.index.get_indexer(df['district'])
+    slot = df[column].to_numpy()
+    known = (rows >= 0) & (slot >= 0)
+    values = np.where(known, grid.to_numpy()[rows, slot.clip(min=0)], np.nan)
+    return pd.Series(values, index=df.index).fillna(district_means)
+
+def create_anomaly_features(df, update_type='generic', reference=None, features=FEATURES):
+    """Create features for anomaly detection (against a saved reference when scoring new data)"""
     df = df.copy()
+    if reference is None:
+        reference = feature_reference(df)
     
     # Basic statistical features
-    df['z_score'] = (df['total'] - df['total'].mean()) / df['total'].std()
+    df['z_score'] = (df['total'] - reference['mean']) / reference['std']
     
-    # Percentile-based
-    df['percentile'] = df['total'].rank(pct=True) * 100
+    # Percentile-based - a sketch lookup, so new batches are ranked against the training data
+    if 'total_sketch' in reference:
+        df['percentile'] = quantile_sketch.sketch_cdf(reference['total_sketch'], df['total']) * 100
+    else:
+        df['percentile'] = df['total'].rank(pct=True) * 100
     
-    # Deviation from state mean
-    state_means = df.groupby('state')['total'].transform('mean')
+    # Deviation from state mean (unseen states fall back to the overall mean)
+    state_means = df['state'].map(reference['state_means']).fillna(reference['mean'])
     df['state_deviation'] = (df['total'] - state_means) / state_means.clip(lower=1)
     
     # Deviation from district mean  
-    district_means = df.groupby('district')['total'].transform('mean')
+    district_means = df['district'].map(reference['district_means']).fillna(reference['mean'])
     df['district_deviation'] = (df['total'] - district_means) / district_means.clip(lower=1)
     
+    # Calendar - compared with the same district on the same weekday and at the same
+    # point of the month, so regular weekend dips and month-start peaks are not
+    # anomalies in themselves (raw 0/1 flags would isolate those days instead)
+    calendar_features.add_calendar_columns(df)
+    dow_baseline = calendar_baseline(df, reference.get('district_dow_means'), 'dayofweek', 7, district_means)
+    df['dow_deviation'] = (df['total'] - dow_baseline) / dow_baseline.clip(lower=1)
+    month_baseline = calendar_baseline(df, reference.get('district_month_edge_means'), 'month_edge',
+                                       calendar_features.MONTH_EDGES, district_means)
+    df['month_edge_deviation'] = (df['total'] - month_baseline) / month_baseline.clip(lower=1)
+    
+    # Spatial - the pincode against its numerically adjacent pincodes (only when the model uses it)
+    if any(feature in NEIGHBOUR_FEATURES for feature in features):
+        add_neighbour_columns(df, reference, district_means)
+    
     return df
 
-def train_isolation_forest(df, contamination=0.01):
+def train_isolation_forest(df, contamination=0.01, n_jobs=None, features=FEATURES):
     """Train Isolation Forest for anomaly detection"""
-    features = ['total', 'z_score', 'state_deviation', 'district_deviation']
-    
     # Handle missing values
     X = df[features].fillna(0)
     
@@ -89,42 +201,322 @@ def train_isolation_forest(df, contamination=0.01):
         contamination=contamination,
         random_state=42,
         n_estimators=100,
-        max_samples='auto'
+        max_samples='auto',
+        n_jobs=n_jobs
     )
     
-    predictions = model.fit_predict(X_scaled)
+    # One scoring pass - fit_predict would score every row twice
+    model.fit(X_scaled)
     scores = model.decision_function(X_scaled)
     
-    # -1 for anomaly, 1 for normal
-    df['is_anomaly'] = (predictions == -1).astype(int)
+    # Negative decision score = anomaly (same rule as predict)
+    df['is_anomaly'] = (scores < 0).astype(int)
     df['anomaly_score'] = -scores  # Higher = more anomalous
     
     return df, model, scaler
 
-def detect_anomalies(enrol_df, bio_df, demo_df):
-    """Detect anomalies in all datasets"""
+def score_with_saved_model(df, name, version=None, contamination=None, update_stats=False, threshold=None):
+    """Score a new batch with a persisted model - decision_function only, no refit
+
+    With a contamination rate the threshold is looked up in the saved score sketch
+    instead of using the rate the model was trained with; an absolute anomaly-score
+    threshold is applied as given. With update_stats the batch
+    is folded into the running statistics store and the features are measured against
+    all history seen so far rather than the training snapshot.
+    """
+    model = model_store.load_model(name, version)
+    df = df.copy()
+    if 'total' not in df.columns:
+        df['total'] = df[TOTAL_COLUMNS[name]].sum(axis=1)
+    
+    reference = model['reference']
+    if update_stats:
+        store = running_stats.update_store(running_stats.load_store(name), df)
+        running_stats.save_store(store, name)
+        reference = {**reference, **running_stats.store_reference(store)}
+    df = create_anomaly_features(df, name, reference=reference, features=model['meta']['features'])
+    
+    scores = model_store.decision_scores(model, df[model['meta']['features']].fillna(0))
+    df['is_anomaly'] = (scores < 0).astype(int)
+    df['anomaly_score'] = -scores
+    
+    score_sketch = model['reference'].get('score_sketch')
+    if score_sketch is not None:
+        df['score_percentile'] = quantile_sketch.sketch_cdf(score_sketch, df['anomaly_score']) * 100
+    if threshold is not None or (contamination is not None and score_sketch is not None):
+        df['is_anomaly'] = model_store.flag_anomalies(df['anomaly_score'], score_sketch, contamination, threshold)
+    return df, model['meta']
+
+def worker_budget(workers=None, tasks=3):
+    """Split a worker budget into (processes, n_jobs per model) without oversubscribing the CPUs"""
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(workers or cpus, cpus))
+    processes = min(workers, tasks)
+    return processes, max(1, workers // processes)
+
+def train_dataset(task):
+    """Feature build + forest fit for one dataset (runs inside a pool worker)"""
+    name, df, n_jobs, features = task
+    started = time.perf_counter()
+    stats = running_stats.build_store(df)
+    reference = running_stats.store_reference(stats)
+    df_features = create_anomaly_features(df, name, reference, features)
+    feature_seconds = time.perf_counter() - started
+    df_result, model, scaler = train_isolation_forest(df_features, n_jobs=n_jobs, features=features)
+    reference['score_sketch'] = quantile_sketch.build_sketch(df_result['anomaly_score'])
+    sketch_error = quantile_sketch.sketch_error(reference['total_sketch'], df_result['total'])
+    return name, df_result, {'model': model, 'scaler': scaler, 'reference': reference, 'rows': len(df_result),
+                             'sketch_error': sketch_error, 'stats': stats, 'feature_seconds': feature_seconds,
+                             'features': features}
+
+def detect_anomalies(enrol_df, bio_df, demo_df, workers=1, features=FEATURES):
+    """Detect anomalies in all datasets - datasets train in parallel processes, trees in threads"""
     print("\n🔍 Training Anomaly Detection Models...")
     
+    processes, n_jobs = worker_budget(workers)
+    print(f"   ⚙️ Worker budget: {processes} process(es) x {n_jobs} tree job(s)")
+    
+    tasks = [(name, df, n_jobs, features) for name, df in [('enrolment', enrol_df), ('biometric', bio_df), ('demographic', demo_df)]]
+    if processes == 1:
+        outputs = [train_dataset(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            outputs = list(pool.map(train_dataset, tasks))
+    
     results = {}
     models = {}
     
-    for name, df in [('enrolment', enrol_df), ('biometric', bio_df), ('demographic', demo_df)]:
-        print(f"\n   Processing {name} data...")
-        
-        # Create features
-        df_features = create_anomaly_features(df, name)
-        
-        # Train model
-        df_result, model, scaler = train_isolation_forest(df_features)
-        
+    for name, df_result, parts in outputs:
         # Count anomalies
         n_anomalies = df_result['is_anomaly'].sum()
         pct_anomalies = (n_anomalies / len(df_result)) * 100
         
         results[name] = df_result
-        models[name] = {'model': model, 'scaler': scaler}
+        models[name] = parts
         
         print(f"      ✅ {name}: {n_anomalies:,} anomalies detected ({pct_anomalies:.2f}%)")
+        print(f"         Features: {len(df_result):,} rows in {parts['feature_seconds']:.2f}s "
+              f"({len(df_result) / max(parts['feature_seconds'], 1e-9) / 1e6:.2f}M rows/s)")
+        error = parts['sketch_error']
+        print(f"         Quantile sketch: {error['centroids']} centroids, max error "
+              f"{error['max_relative_error']:.2%} in value / {error['max_rank_error']:.3%} in rank")
+    
+    return results, models
+
+def detect_anomalies_chunked(chunk_rows=model_store.CHUNK_ROWS, sample_rows=model_store.SAMPLE_ROWS, workers=1,
+                             features=FEATURES):
+    """Fit on a state-stratified sample, then score each file in chunks streamed from disk"""
+    print(f"\n🔍 Subsample fit ({sample_rows:,} rows) + chunked scoring ({chunk_rows:,} rows per chunk)...")
+    os.makedirs('anomaly_reports', exist_ok=True)
+    
+    summaries = {}
+    for name, path in DATA_PATHS.items():
+        summaries[name] = model_store.detect_chunked(
+            name, path, TOTAL_COLUMNS[name],
+            lambda chunk, reference: create_anomaly_features(chunk, name, reference, features),
+            features, f'anomaly_reports/{name}_anomalies.csv',
+            REPORT_COLUMNS + [f'contrib_{feature}' for feature in features] + ['top_feature'],
+            chunk_rows=chunk_rows, sample_rows=sample_rows, n_jobs=workers,
+            explain=lambda hits, model: explain_forest(hits, model['forest'], model['scaler'], model['meta']['features'])
+        )
+        summary = summaries[name]
+        print(f"      ✅ {name}: {summary['flagged']:,} of {summary['rows']:,} flagged ({summary['rate']:.2f}%), "
+              f"fit on {summary['sample_rows']:,} sampled rows, model {summary['version']}")
+    return summaries
+
+# ============================================================
+# ROBUST (MEDIAN / MAD) ENGINE
+# ============================================================
+
+def robust_baselines(df):
+    """Median and MAD of the totals overall, per state and per district"""
+    total = df['total'].astype(float)
+    median = total.median()
+    baselines = {'overall': pd.DataFrame({'median': [median], 'mad': [(total - median).abs().median()]}, index=['all'])}
+    for level in ROBUST_LEVELS:
+        # transform keeps the group medians row-aligned, so the MAD is one more grouped median
+        row_median = total.groupby(df[level], sort=False).transform('median')
+        deviation = (total - row_median).abs()
+        baselines[level] = pd.DataFrame({'median': row_median.groupby(df[level], sort=False).first(),
+                                         'mad': deviation.groupby(df[level], sort=False).median()})
+    return baselines
+
+def robust_level_scores(df, baselines):
+    """Modified z-score of each row against its state and against its district"""
+    total = df['total'].to_numpy(dtype=float)
+    overall = baselines['overall'].iloc[0]
+    scores = {}
+    for level in ROBUST_LEVELS:
+        # Unseen groups fall back to the overall median / MAD
+        median = df[level].map(baselines[level]['median']).fillna(overall['median']).to_numpy()
+        mad = df[level].map(baselines[level]['mad']).fillna(overall['mad']).to_numpy()
+        # Counts are integers - a MAD below 1 (half the group identical) would blow every step up
+        scores[level] = 0.6745 * (total - median) / np.fmax(mad, 1)
+    return scores
+
+def robust_scores(df, baselines):
+    """Modified z-score against the row's state and district - the larger of the two is the score"""
+    scores = robust_level_scores(df, baselines)
+    return np.fmax(scores['state'], scores['district'])
+
+def detect_anomalies_robust(datasets, z_threshold=ROBUST_Z):
+    """Grouped median / MAD robust z-scores - no model fit, seconds on the full data"""
+    print(f"\n🔍 Robust z-score engine (median / MAD per state and district, z > {z_threshold})...")
+    
+    results = {}
+    models = {}
+    for name, df in datasets.items():
+        started = time.perf_counter()
+        baselines = robust_baselines(df)
+        scores = robust_scores(df, baselines)
+        elapsed = time.perf_counter() - started
+        
+        results[name] = df_result = df.assign(is_anomaly=(scores > z_threshold).astype(int), anomaly_score=scores)
+        models[name] = {'baselines': baselines, 'z_threshold': z_threshold, 'rows': len(df)}
+        n_anomalies = df_result['is_anomaly'].sum()
+        print(f"      ✅ {name}: {n_anomalies:,} anomalies detected ({n_anomalies / len(df) * 100:.2f}%) in {elapsed:.2f}s")
+    
+    return results, models
+
+# ============================================================
+# EXPLANATIONS (flagged rows only)
+# ============================================================
+
+def explanation_frame(shares, index, features=FEATURES):
+    """contrib_<feature> shares (summing to 1) and the top feature for each flagged row"""
+    frame = pd.DataFrame(shares.round(3), index=index, columns=[f'contrib_{feature}' for feature in features])
+    frame['top_feature'] = np.array(features)[shares.argmax(axis=1)]
+    return frame
+
+def explain_forest(flagged, model, scaler, features=FEATURES):
+    """Isolation path attributions for flagged rows that already carry the feature columns"""
+    X = scaler.transform(flagged[features].fillna(0))
+    return explanation_frame(model_store.path_attributions(model, X), flagged.index, features)
+
+def explain_robust(flagged, baselines):
+    """State vs district share of the robust z-score (total and z_score take no part in it)"""
+    scores = robust_level_scores(flagged, baselines)
+    shares = np.zeros((len(flagged), len(FEATURES)))
+    shares[:, FEATURES.index('state_deviation')] = np.fmax(scores['state'], 0)
+    shares[:, FEATURES.index('district_deviation')] = np.fmax(scores['district'], 0)
+    return explanation_frame(shares / np.fmax(shares.sum(axis=1, keepdims=True), 1e-12), flagged.index)
+
+def explain_anomalies(results, models):
+    """Per-feature contributions for every flagged row, one vectorized batch per model"""
+    print("\n🔎 Explaining flagged records...")
+    
+    explanations = {}
+    for name, df in results.items():
+        started = time.perf_counter()
+        flagged = df[df['is_anomaly'] == 1]
+        parts = models[name]
+        if 'baselines' in parts:
+            frame = explain_robust(flagged, parts['baselines'])
+        elif 'segments' in parts:
+            # Segment frames hold raw columns only - rebuild the features of the flagged rows from each segment's reference
+            frames = []
+            features = FEATURES
+            for segment, segment_parts in parts['segments'].items():
+                features = segment_parts.get('features', FEATURES)
+                segment_flagged = flagged[flagged['segment'] == segment]
+                if len(segment_flagged):
+                    segment_flagged = create_anomaly_features(segment_flagged, name, segment_parts['reference'], features)
+                    frames.append(explain_forest(segment_flagged, segment_parts['model'], segment_parts['scaler'], features))
+            frame = pd.concat(frames) if frames else explanation_frame(np.zeros((0, len(features))), flagged.index, features)
+        else:
+            frame = explain_forest(flagged, parts['model'], parts['scaler'], parts.get('features', FEATURES))
+        explanations[name] = frame
+        elapsed = time.perf_counter() - started
+        
+        drivers = frame['top_feature'].value_counts(normalize=True) * 100
+        top = ', '.join(f'{feature} {share:.0f}%' for feature, share in drivers.head(3).items())
+        print(f"   ✅ {name}: {len(frame):,} flagged rows of {len(df):,} explained in {elapsed:.2f}s ({top})")
+    
+    return explanations
+
+def plan_segments(df, min_rows=MIN_SEGMENT_ROWS):
+    """One segment per large state, small states pooled together"""
+    counts = df['state'].value_counts()
+    segments = {state: [state] for state in counts.index[counts >= min_rows]}
+    small = counts.index[counts < min_rows].tolist()
+    if small:
+        segments[POOLED_SEGMENT] = small
+    return segments
+
+def calibrated_scores(decision):
+    """-log10 of the within-segment tail probability - comparable across segments of any size"""
+    # rank 1 = most anomalous; p = share of the segment at least this anomalous
+    tail = pd.Series(decision).rank(method='max').to_numpy() / len(decision)
+    return -np.log10(tail)
+
+def train_segment(task):
+    """Fit and score one segment (runs inside a pool worker)"""
+    name, segment, positions, df, contamination, features = task
+    reference = feature_reference(df)
+    df_features = create_anomaly_features(df, name, reference, features)
+    X = df_features[features].fillna(0)
+    
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+    
+    # Build the trees from a bounded random subset and score every row once; the
+    # threshold is then set the way IsolationForest.fit would (contamination percentile)
+    rng = np.random.default_rng(42)
+    fit_rows = X_scaled if len(X_scaled) <= SEGMENT_FIT_ROWS else X_scaled[rng.choice(len(X_scaled), SEGMENT_FIT_ROWS, replace=False)]
+    model = IsolationForest(contamination='auto', random_state=42, n_estimators=100)
+    model.fit(fit_rows)
+    raw = model.score_samples(X_scaled)
+    model.contamination = contamination
+    model.offset_ = np.percentile(raw, 100 * contamination)
+    decision = raw - model.offset_
+    
+    reference['score_sketch'] = quantile_sketch.build_sketch(-decision)
+    parts = {'model': model, 'scaler': scaler, 'reference': reference, 'rows': len(df), 'features': features}
+    return name, segment, positions, (decision < 0).astype(int), calibrated_scores(decision), parts
+
+def detect_anomalies_segmented(enrol_df, bio_df, demo_df, workers=1, contamination=0.01, min_rows=MIN_SEGMENT_ROWS,
+                               features=FEATURES):
+    """One model per state (small states pooled), all segments of all datasets in one process pool"""
+    datasets = {'enrolment': enrol_df, 'biometric': bio_df, 'demographic': demo_df}
+    return detect_segmented(datasets, workers, contamination, min_rows, features)
+
+def detect_segmented(datasets, workers=1, contamination=0.01, min_rows=MIN_SEGMENT_ROWS, features=FEATURES):
+    """Segmented detection for any {name: frame} mapping"""
+    print("\n🔍 Training Segmented (per-state) Anomaly Models...")
+    
+    tasks = []
+    for name, df in datasets.items():
+        for segment, states in plan_segments(df, min_rows).items():
+            positions = np.flatnonzero(df['state'].isin(states).to_numpy())
+            tasks.append((name, segment, positions, df.iloc[positions], contamination, features))
+    # Largest segments first - idle workers pull the next task, so the big states
+    # start early and the small ones fill in around them instead of straggling at the end
+    tasks.sort(key=lambda task: -len(task[2]))
+    
+    processes = max(1, min(workers or 1, os.cpu_count() or 1, len(tasks)))
+    print(f"   ⚙️ {len(tasks)} segments on {processes} process(es)")
+    if processes == 1:
+        outputs = [train_segment(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(train_segment, task) for task in tasks]
+            outputs = [future.result() for future in as_completed(futures)]
+    
+    columns = {name: {'segment': np.full(len(df), '', dtype=object), 'is_anomaly': np.zeros(len(df), dtype=int),
+                      'anomaly_score': np.zeros(len(df))} for name, df in datasets.items()}
+    models = {name: {'segments': {}} for name in datasets}
+    for name, segment, positions, is_anomaly, scores, parts in outputs:
+        columns[name]['segment'][positions] = segment
+        columns[name]['is_anomaly'][positions] = is_anomaly
+        columns[name]['anomaly_score'][positions] = scores
+        models[name]['segments'][segment] = parts
+    
+    results = {}
+    for name, df in datasets.items():
+        results[name] = df_result = df.assign(**columns[name])
+        n_anomalies = df_result['is_anomaly'].sum()
+        print(f"      ✅ {name}: {n_anomalies:,} anomalies across {len(models[name]['segments'])} segments "
+              f"({n_anomalies / len(df_result) * 100:.2f}%)")
     
     return results, models
 
@@ -159,7 +551,7 @@ def analyze_anomalies(results):
     
     return analysis
 
-def visualize_anomalies(results):
+def visualize_anomalies(results, threshold=0):
     """Create anomaly detection visualizations"""
     print("\n📈 Generating anomaly visualizations...")
     
@@ -192,7 +584,7 @@ def visualize_anomalies(results):
     ax3 = axes[1, 0]
     for name, df, color in zip(results.keys(), results.values(), colors):
         ax3.hist(df['anomaly_score'], bins=50, alpha=0.5, label=name.capitalize(), color=color)
-    ax3.axvline(x=0, color='red', linestyle='--', linewidth=2, label='Threshold')
+    ax3.axvline(x=threshold, color='red', linestyle='--', linewidth=2, label='Threshold')
     ax3.set_title('Anomaly Score Distribution', fontweight='bold')
     ax3.set_xlabel('Anomaly Score (Higher = More Anomalous)')
     ax3.set_ylabel('Frequency')
@@ -212,7 +604,7 @@ def visualize_anomalies(results):
     plt.close()
     print("   ✅ Saved: anomaly_detection_results.png")
 
-def save_anomaly_results(results, models, analysis):
+def save_anomaly_results(results, models, analysis, explanations=None):
     """Save anomaly detection results"""
     print("\n💾 Saving anomaly detection results...")
     
@@ -222,7 +614,9 @@ def save_anomaly_results(results, models, analysis):
     
     # Save flagged anomalies
     for name, df in results.items():
-        anomalies = df[df['is_anomaly'] == 1][['date', 'state', 'district', 'pincode', 'total', 'anomaly_score']]
+        anomalies = df[df['is_anomaly'] == 1][REPORT_COLUMNS]
+        if explanations is not None:
+            anomalies = anomalies.join(explanations[name])
         anomalies = anomalies.sort_values('anomaly_score', ascending=False)
         anomalies.to_csv(f'anomaly_reports/{name}_anomalies.csv', index=False)
         print(f"   ✅ Saved: {name}_anomalies.csv ({len(anomalies)} records)")
@@ -231,10 +625,41 @@ def save_anomaly_results(results, models, analysis):
     with open('trained_models/anomaly_model_info.pkl', 'wb') as f:
         pickle.dump(analysis, f)
     print("   ✅ Saved: anomaly_model_info.pkl")
+    
+    # Save fitted scaler + forest so later batches are scored without a refit
+    for name, parts in models.items():
+        if 'baselines' in parts:
+            # Robust engine - the medians / MADs are the whole model
+            with open(f'trained_models/{name}_robust_baselines.pkl', 'wb') as f:
+                pickle.dump(parts, f)
+            print(f"   ✅ Saved: {name}_robust_baselines.pkl")
+            continue
+        if 'segments' in parts:
+            for segment, segment_parts in parts['segments'].items():
+                model_store.save_model(f"{name}_by_state/{segment.replace('/', '-')}", segment_parts['scaler'], segment_parts['model'],
+                                       segment_parts['reference'], segment_parts.get('features', FEATURES),
+                                       rows=segment_parts['rows'])
+            print(f"   ✅ Saved: {model_store.MODEL_DIR}/{name}_by_state ({len(parts['segments'])} segment models)")
+            continue
+        version = model_store.save_model(name, parts['scaler'], parts['model'], parts['reference'],
+                                         parts.get('features', FEATURES), rows=parts['rows'])
+        print(f"   ✅ Saved: {model_store.MODEL_DIR}/{name}/{version}")
+        # Training data seeds the running statistics that later batches are folded into
+        print(f"   ✅ Saved: {running_stats.save_store(parts['stats'], name)}")
 
-def create_anomaly_summary():
+def create_anomaly_summary(segmented=False, engine='forest', robust_z=ROBUST_Z, neighbours=False):
     """Create summary report"""
-    summary = """
+    if engine == 'robust':
+        methodology = f"""- Robust z-scores (median / MAD per state and district, no model fit)
+- Feature: Total count against the state and district medians
+- Threshold: modified z-score above {robust_z} (flag rate follows the data)"""
+    else:
+        methodology = """- Isolation Forest algorithm (unsupervised ML)
+- Features: Total count, Z-score, State deviation, District deviation,
+  deviation from the district's own weekday and month start / mid / end averages
+- Contamination rate: 1% (flag top 1% most unusual records)"""
+    
+    summary = f"""
 ================================================================================
 UIDAI ANOMALY DETECTION - EXECUTIVE SUMMARY
 ================================================================================
@@ -246,9 +671,7 @@ Identify unusual patterns in Aadhaar enrolment and update data that may indicate
 - Operational inefficiencies at specific locations
 
 METHODOLOGY:
-- Isolation Forest algorithm (unsupervised ML)
-- Features: Total count, Z-score, State deviation, District deviation
-- Contamination rate: 1% (flag top 1% most unusual records)
+{methodology}
 
 KEY FINDINGS:
 1. Anomalies cluster in specific districts - suggesting localized issues
@@ -261,6 +684,37 @@ RECOMMENDATIONS:
 3. Review equipment and processes at high-anomaly centers
 4. Implement real-time anomaly monitoring system
 
+================================================================================
+"""
+    
+    if segmented:
+        summary += """
+SEGMENTED MODE:
+One Isolation Forest per state (small states pooled), each flagging its own top 1%.
+Scores are -log10 of the within-state tail probability, so a score of 2 means
+"rarer than 99% of this state's records" regardless of the state's volume.
+
+================================================================================
+"""
+    
+    if engine == 'robust':
+        summary += f"""
+ROBUST ENGINE:
+Each record is scored by its modified z-score, 0.6745 x (total - median) / MAD,
+against its own state and its own district; the larger of the two is the score.
+Groups never seen in training fall back to the national median / MAD.
+
+================================================================================
+"""
+    
+    if neighbours:
+        summary += f"""
+NEIGHBOUR FEATURES:
+Each record is also compared with the {NEIGHBOUR_WINDOW} numerically adjacent pincodes on either
+side within its own district - both its own volume and its pincode's average volume
+against the neighbours' average. A pincode far out of line with the ones next to it
+is flagged even when its district as a whole looks normal.
+
 ================================================================================
 """
     
@@ -268,26 +722,85 @@ RECOMMENDATIONS:
         f.write(summary)
     print("   ✅ Saved: executive_summary.txt")
 
+def score_new_batch(path, name, version=None, contamination=None, update_stats=False, threshold=None):
+    """Score a CSV with the saved model and write its flagged rows"""
+    print(f"\n📂 Scoring {path} with the saved {name} model...")
+    df, meta = score_with_saved_model(pd.read_csv(path), name, version, contamination, update_stats, threshold)
+    
+    import os
+    os.makedirs('anomaly_reports', exist_ok=True)
+    columns = [c for c in REPORT_COLUMNS if c in df.columns]
+    anomalies = df[df['is_anomaly'] == 1]
+    model = model_store.load_model(name, meta['version'])
+    anomalies = anomalies[columns].join(explain_forest(anomalies, model['forest'], model['scaler'], meta['features']))
+    anomalies = anomalies.sort_values('anomaly_score', ascending=False)
+    anomalies.to_csv(f'anomaly_reports/{name}_scored_anomalies.csv', index=False)
+    print(f"   ✅ {meta['version']}: {len(anomalies):,} of {len(df):,} rows flagged")
+    print(f"   ✅ Saved: {name}_scored_anomalies.csv")
+
 def main():
+    parser = argparse.ArgumentParser(description='UIDAI anomaly detection')
+    parser.add_argument('--score', metavar='CSV', help='Score a new batch with the saved model instead of training')
+    parser.add_argument('--dataset', choices=list(TOTAL_COLUMNS), default='enrolment', help='Model to score with')
+    parser.add_argument('--version', help='Model version to score with (default: latest)')
+    parser.add_argument('--contamination', type=float, help='Flag rate for --score, looked up in the saved score sketch')
+    parser.add_argument('--threshold', type=float, help='Absolute anomaly-score cut-off for --score (overrides --contamination)')
+    parser.add_argument('--update-stats', action='store_true', help='Fold the --score batch into the running statistics (score each batch once)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Total CPU budget for training (capped at the CPU count)')
+    parser.add_argument('--engine', choices=ENGINES, default='forest', help='forest = Isolation Forest, robust = median / MAD z-scores (fast daily check)')
+    parser.add_argument('--robust-z', type=float, default=ROBUST_Z, help='Modified z-score cut-off for --engine robust')
+    parser.add_argument('--segmented', action='store_true', help='One model per state (small states pooled) instead of one national model')
+    parser.add_argument('--neighbours', action='store_true', help='Add the adjacent-pincode deviation features to the forest models')
+    parser.add_argument('--chunked', action='store_true', help='Fit on a stratified sample and score in chunks (data larger than memory)')
+    parser.add_argument('--chunk-rows', type=int, default=model_store.CHUNK_ROWS, help='Rows per scoring chunk in --chunked mode')
+    parser.add_argument('--sample-rows', type=int, default=model_store.SAMPLE_ROWS, help='Training sample size in --chunked mode')
+    args = parser.parse_args()
+    if args.engine == 'robust' and (args.segmented or args.chunked or args.score or args.neighbours):
+        parser.error('--engine robust runs on the full datasets; it does not combine with --segmented, --chunked, --score or --neighbours')
+    features = FEATURES + NEIGHBOUR_FEATURES if args.neighbours else FEATURES
+    
     print("\n" + "="*60)
     print("🔍 UIDAI ANOMALY DETECTION MODEL")
     print("="*60)
     
+    if args.score:
+        score_new_batch(args.score, args.dataset, args.version, args.contamination, args.update_stats, args.threshold)
+        return
+    
+    if args.chunked:
+        # Flagged rows are appended while scoring; charts need the full frames and are skipped
+        detect_anomalies_chunked(args.chunk_rows, args.sample_rows, min(args.workers, os.cpu_count() or 1), features)
+        print("\n✅ Chunked anomaly detection complete!\n")
+        return
+    
     # Load data
     enrol_df, bio_df, demo_df = load_all_data()
     
     # Detect anomalies
-    results, models = detect_anomalies(enrol_df, bio_df, demo_df)
+    if args.engine == 'robust':
+        results, models = detect_anomalies_robust({'enrolment': enrol_df, 'biometric': bio_df, 'demographic': demo_df},
+                                                  args.robust_z)
+    elif args.segmented:
+        results, models = detect_anomalies_segmented(enrol_df, bio_df, demo_df, workers=args.workers, features=features)
+    else:
+        results, models = detect_anomalies(enrol_df, bio_df, demo_df, workers=args.workers, features=features)
     
     # Analyze patterns
     analysis = analyze_anomalies(results)
     
     # Visualize
-    visualize_anomalies(results)
+    if args.engine == 'robust':
+        threshold = args.robust_z
+    else:
+        threshold = -np.log10(0.01) if args.segmented else 0
+    visualize_anomalies(results, threshold=threshold)
+    
+    # Explain flagged rows
+    explanations = explain_anomalies(results, models)
     
     # Save
-    save_anomaly_results(results, models, analysis)
-    create_anomaly_summary()
+    save_anomaly_results(results, models, analysis, explanations)
+    create_anomaly_summary(args.segmented, args.engine, args.robust_z, args.neighbours)
     
     # Final summary
     print("\n" + "-"*60)
@@ -0,0 +1,310 @@
+"""
+UIDAI Anomaly Detection Benchmarks
+Times the anomaly training paths on synthetic data shaped like the Aadhaar datasets
+UIDAI Data Hackathon 2026
+
+Run: python benchmark_anomaly.py --scaling [--rows 1000000]
+     python benchmark_anomaly.py --suite [--sizes 1M,10M,50M] [--engines forest,segmented]
+     python benchmark_anomaly.py --features [--rows 1000000] [--neighbours]
+"""
+
+import argparse
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+import anomaly_detector
+import model_store
+
+INJECT_RATE = 0.01          # Share of rows turned into known anomalies
+INJECT_FACTOR = (6, 15)     # Injected totals are this many times the district's typical volume
+
+def make_synthetic(rows, seed=42, n_states=36, districts_per_state=20, pincodes_per_district=25, inject=0.0):
+    """Synthetic records with Aadhaar-like skew (a few states carry most of the volume).
+    With inject > 0 that share of rows becomes a volume spike, labelled in is_injected"""
+    rng = np.random.default_rng(seed)
+    state_weights = rng.pareto(1.2, n_states) + 0.05
+    state = rng.choice(n_states, rows, p=state_weights / state_weights.sum())
+    district = state * districts_per_state + rng.integers(0, districts_per_state, rows)
+    pincode = 100000 + district * pincodes_per_district + rng.integers(0, pincodes_per_district, rows)
+    scale = (1 + state_weights[state]).round().astype(np.int64)
+    df = pd.DataFrame({
+        'date': pd.Timestamp('2025-03-01') + pd.to_timedelta(rng.integers(0, 300, rows), unit='D'),
+        'state': np.array([f'State {i:02d}' for i in range(n_states)], dtype=object)[state],
+        'district': np.array([f'District {i:04d}' for i in range(n_states * districts_per_state)], dtype=object)[district],
+        'pincode': pincode,
+        'total': rng.negative_binomial(2, 0.05, rows) * scale
+    })
+    if inject:
+        # Spikes are relative to the state's own scale (NB(2, 0.05) has mean 38), so a
+        # small-state spike stays small in national terms - the hard case for a national model
+        injected = rng.random(rows) < inject
+        factor = rng.integers(INJECT_FACTOR[0], INJECT_FACTOR[1] + 1, injected.sum())
+        df.loc[injected, 'total'] = 38 * scale[injected] * factor
+        df['is_injected'] = injected.astype(np.int8)
+    return df
+
+# ============================================================
+# SCALING BENCHMARK
+# ============================================================
+
+SCALING_WORKERS = [1, 2, 4, 8, 16]
+
+def run_scaling(rows, workers_list=SCALING_WORKERS):
+    """Train all three dataset models at each worker budget and report the speedup"""
+    print(f"\n⏱️ Scaling benchmark: 3 datasets x {rows:,} rows, {os.cpu_count()} CPU(s) available")
+    frames = [make_synthetic(rows, seed) for seed in (1, 2, 3)]
+
+    records = []
+    baseline = None
+    for workers in workers_list:
+        processes, n_jobs = anomaly_detector.worker_budget(workers)
+        started = time.perf_counter()
+        results, _ = anomaly_detector.detect_anomalies(*frames, workers=workers)
+        elapsed = time.perf_counter() - started
+
+        flagged = sum(int(df['is_anomaly'].sum()) for df in results.values())
+        baseline = baseline or (elapsed, flagged)
+        records.append({
+            'workers': workers, 'processes': processes, 'tree_jobs': n_jobs,
+            'seconds': round(elapsed, 2), 'speedup': round(baseline[0] / elapsed, 2),
+            'flagged': flagged, 'same_flags': flagged == baseline[1]
+        })
+
+    table = pd.DataFrame(records)
+    print("\n" + table.to_string(index=False))
+    os.makedirs('anomaly_reports', exist_ok=True)
+    table.to_csv('anomaly_reports/parallel_scaling.csv', index=False)
+    print("\n   ✅ Saved: anomaly_reports/parallel_scaling.csv")
+    return table
+
+# ============================================================
+# SEGMENTED VS NATIONAL MODEL
+# ============================================================
+
+def top_state_share(df):
+    """Share of flagged rows falling in the two highest-volume states vs their share of all rows"""
+    top = df['state'].value_counts().index[:2]
+    flagged = df[df['is_anomaly'] == 1]
+    return flagged['state'].isin(top).mean() * 100, df['state'].isin(top).mean() * 100
+
+def run_segmented(rows, workers=None):
+    """Time the national model against per-state segments and compare where the flags land"""
+    print(f"\n⏱️ Segmented benchmark: 3 datasets x {rows:,} rows")
+    frames = [make_synthetic(rows, seed) for seed in (1, 2, 3)]
+
+    records = []
+    for mode, detect in [('national', anomaly_detector.detect_anomalies),
+                         ('segmented', anomaly_detector.detect_anomalies_segmented)]:
+        started = time.perf_counter()
+        results, _ = detect(*frames, workers=workers)
+        elapsed = time.perf_counter() - started
+        flag_share, row_share = top_state_share(results['enrolment'])
+        records.append({'mode': mode, 'seconds': round(elapsed, 2),
+                        'flagged': sum(int(df['is_anomaly'].sum()) for df in results.values()),
+                        'top2_state_flag_pct': round(flag_share, 1), 'top2_state_row_pct': round(row_share, 1)})
+
+    table = pd.DataFrame(records)
+    print("\n" + table.to_string(index=False))
+    os.makedirs('anomaly_reports', exist_ok=True)
+    table.to_csv('anomaly_reports/segmented_benchmark.csv', index=False)
+    print("\n   ✅ Saved: anomaly_reports/segmented_benchmark.csv")
+    return table
+
+# ============================================================
+# FEATURE BUILD SCALING
+# ============================================================
+
+FEATURE_SCALES = [0.25, 0.5, 1.0]
+
+def run_feature_scaling(rows, scales=FEATURE_SCALES, neighbours=False):
+    """Time the feature build (reference + features, calendar included) at growing sizes -
+    seconds per million rows should stay flat if the build is linear"""
+    features = anomaly_detector.FEATURES + anomaly_detector.NEIGHBOUR_FEATURES if neighbours else anomaly_detector.FEATURES
+    print(f"\n⏱️ Feature build scaling up to {rows:,} rows{' (neighbour features included)' if neighbours else ''}")
+    records = []
+    for scale in scales:
+        df = make_synthetic(int(rows * scale))
+        # Dates as they are on disk (DD-MM-YYYY strings), so the parse is part of the timing
+        df['date'] = df['date'].dt.strftime('%d-%m-%Y')
+        started = time.perf_counter()
+        reference = anomaly_detector.feature_reference(df)
+        anomaly_detector.create_anomaly_features(df, reference=reference, features=features)
+        elapsed = time.perf_counter() - started
+        records.append({'rows': len(df), 'seconds': round(elapsed, 3),
+                        'seconds_per_million': round(elapsed / len(df) * 1e6, 3)})
+
+    table = pd.DataFrame(records)
+    print("\n" + table.to_string(index=False))
+    os.makedirs('anomaly_reports', exist_ok=True)
+    table.to_csv('anomaly_reports/feature_scaling.csv', index=False)
+    print("\n   ✅ Saved: anomaly_reports/feature_scaling.csv")
+    return table
+
+# ============================================================
+# ENGINE SUITE (fit / score time, peak memory, precision / recall)
+# ============================================================
+
+SUITE_SIZES = '1M,10M,50M'
+SUITE_RESULTS = 'anomaly_reports/benchmark_results.csv'
+
+def parse_size(text):
+    """'1M' / '500K' / '2000000' -> rows"""
+    text = text.strip().upper()
+    units = {'K': 1_000, 'M': 1_000_000}
+    return int(float(text[:-1]) * units[text[-1]]) if text[-1] in units else int(text)
+
+def engine_forest(df, workers, features=anomaly_detector.FEATURES):
+    """The pipeline path - train_isolation_forest on every row, then a rescoring pass"""
+    started = time.perf_counter()
+    df = anomaly_detector.create_anomaly_features(df, features=features)
+    feature_seconds = time.perf_counter() - started
+
+    # train_isolation_forest fits and scores the training rows once, as run_anomaly_detection does
+    started = time.perf_counter()
+    df, forest, scaler = anomaly_detector.train_isolation_forest(df, n_jobs=workers, features=features)
+    fit_seconds = time.perf_counter() - started
+
+    # Scoring a batch of the same size against the fitted model (score_with_saved_model path)
+    started = time.perf_counter()
+    scores = model_store.decision_scores({'forest': forest, 'scaler': scaler}, df[features].fillna(0))
+    score_seconds = time.perf_counter() - started
+    return (scores < 0).astype(int), feature_seconds, fit_seconds, score_seconds
+
+def engine_forest_neighbours(df, workers):
+    """The pipeline path with the adjacent-pincode features added"""
+    return engine_forest(df, workers, anomaly_detector.FEATURES + anomaly_detector.NEIGHBOUR_FEATURES)
+
+def engine_forest_subsample(df, workers):
+    """Fit on a weighted random sample, score every row (the --chunked path, in memory)"""
+    started = time.perf_counter()
+    df = anomaly_detector.create_anomaly_features(df)
+    feature_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    sample = df.sample(min(len(df), model_store.SAMPLE_ROWS), random_state=42)
+    sample['sample_weight'] = len(df) / len(sample)
+    scaler, forest, _ = model_store.fit_on_sample(sample, anomaly_detector.FEATURES, n_jobs=workers)
+    fit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scores = model_store.decision_scores({'forest': forest, 'scaler': scaler}, df[anomaly_detector.FEATURES].fillna(0))
+    score_seconds = time.perf_counter() - started
+    return (scores < 0).astype(int), feature_seconds, fit_seconds, score_seconds
+
+def engine_segmented(df, workers):
+    """Per-state models - each segment is fitted and scored in one worker task, so only the total is timed"""
+    started = time.perf_counter()
+    results, _ = anomaly_detector.detect_segmented({'synthetic': df}, workers=workers)
+    return results['synthetic']['is_anomaly'].to_numpy(), np.nan, time.perf_counter() - started, np.nan
+
+def engine_robust(df, workers):
+    """Median / MAD z-scores - the baselines are the fit, the z-scores the scoring"""
+    started = time.perf_counter()
+    baselines = anomaly_detector.robust_baselines(df)
+    fit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scores = anomaly_detector.robust_scores(df, baselines)
+    score_seconds = time.perf_counter() - started
+    return (scores > anomaly_detector.ROBUST_Z).astype(int), 0.0, fit_seconds, score_seconds
+
+ENGINES = {
+    'forest': engine_forest,
+    'forest_neighbours': engine_forest_neighbours,
+    'forest_subsample': engine_forest_subsample,
+    'segmented': engine_segmented,
+    'robust': engine_robust
+}
+
+def peak_rss_mb():
+    """Peak resident memory of this process and any pool workers it waited on"""
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak / 1024  # ru_maxrss is in KiB on Linux
+
+def run_engine(task):
+    """One engine on one size, in a fresh process so the memory peak belongs to this run alone"""
+    engine, rows, workers, seed = task
+    df = make_synthetic(rows, seed, inject=INJECT_RATE)
+    labels = df.pop('is_injected').to_numpy()
+    data_mb = peak_rss_mb()
+
+    flags, feature_seconds, fit_seconds, score_seconds = ENGINES[engine](df, workers)
+    peak_mb = peak_rss_mb()
+
+    hits = int((flags & labels).sum())
+    return {
+        'engine': engine, 'rows': rows, 'workers': workers,
+        'feature_seconds': round(feature_seconds, 2), 'fit_seconds': round(fit_seconds, 2),
+        'score_seconds': round(score_seconds, 2),
+        'peak_mb': round(peak_mb), 'engine_mb': round(peak_mb - data_mb),
+        'injected': int(labels.sum()), 'flagged': int(flags.sum()),
+        'precision': round(hits / max(flags.sum(), 1), 4), 'recall': round(hits / max(labels.sum(), 1), 4)
+    }
+
+def run_suite(sizes, engines, workers=None, seed=7, out_path=SUITE_RESULTS):
+    """Every engine at every size, appended to the results file with a timestamp"""
+    print(f"\n⏱️ Engine suite: {', '.join(engines)} at {', '.join(f'{rows:,}' for rows in sizes)} rows "
+          f"({INJECT_RATE:.0%} injected anomalies)")
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    run_at = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    records = []
+    for rows in sizes:
+        for engine in engines:
+            # max_workers=1 pool = a clean child process per run; the parent never holds the data
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                record = pool.submit(run_engine, (engine, rows, workers, seed)).result()
+            record['run_at'] = run_at
+            records.append(record)
+            score = '-' if np.isnan(record['score_seconds']) else f"{record['score_seconds']}s"
+            print(f"   ✅ {engine} @ {rows:,}: fit {record['fit_seconds']}s, score {score}, "
+                  f"peak {record['peak_mb']:,} MB, precision {record['precision']:.3f}, recall {record['recall']:.3f}")
+            # Written after every run - a 50M run that dies still leaves the smaller results behind
+            pd.DataFrame([record]).to_csv(out_path, mode='a', header=not os.path.exists(out_path), index=False)
+
+    table = pd.DataFrame(records)
+    print("\n" + table.drop(columns='run_at').to_string(index=False))
+    print(f"\n   ✅ Appended {len(table)} runs to: {out_path}")
+    return table
+
+def main():
+    parser = argparse.ArgumentParser(description='Anomaly detection benchmarks')
+    parser.add_argument('--scaling', action='store_true', help='Worker scaling benchmark (1/2/4/8/16 workers)')
+    parser.add_argument('--segmented', action='store_true', help='National vs per-state segmented models')
+    parser.add_argument('--features', action='store_true', help='Feature build time at 1/4, 1/2 and all of --rows')
+    parser.add_argument('--neighbours', action='store_true', help='Include the adjacent-pincode features in --features')
+    parser.add_argument('--suite', action='store_true', help='Every engine at every size with injected anomalies')
+    parser.add_argument('--sizes', default=SUITE_SIZES, help='Comma-separated row counts for --suite (e.g. 1M,10M,50M)')
+    parser.add_argument('--engines', default=','.join(ENGINES), help='Comma-separated engines for --suite')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker budget for --segmented / --suite')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows per synthetic dataset')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("⏱️ UIDAI ANOMALY DETECTION BENCHMARKS")
+    print("="*60)
+
+    if args.scaling:
+        run_scaling(args.rows)
+    elif args.segmented:
+        run_segmented(args.rows, args.workers)
+    elif args.features:
+        run_feature_scaling(args.rows, neighbours=args.neighbours)
+    elif args.suite:
+        engines = [engine.strip() for engine in args.engines.split(',')]
+        unknown = set(engines) - set(ENGINES)
+        if unknown:
+            parser.error(f"unknown engine(s): {', '.join(sorted(unknown))} (choose from {', '.join(ENGINES)})")
+        run_suite([parse_size(size) for size in args.sizes.split(',')], engines, args.workers)
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+UIDAI Calendar Features
+Day of week and month start / end position of each record's date
+UIDAI Data Hackathon 2026
+
+Datasets have millions of rows but only a few hundred distinct dates, so each
+distinct date is parsed once per process and the rows pick their values up by
+position - linear in the rows, with the date parsing done per unique value.
+"""
+
+import numpy as np
+import pandas as pd
+
+CALENDAR_COLUMNS = ['dayofweek', 'is_month_start', 'is_month_end', 'month_edge']
+MONTH_EDGES = 3  # month_edge: 0 = mid-month, 1 = first day, 2 = last day
+
+_calendar_cache = {}  # date value -> (dayofweek, is_month_start, is_month_end, month_edge)
+
+def _parse_dates(values):
+    dates = pd.Series(values)
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    # Reports and cleaned files carry either ISO (YYYY-MM-DD) or DD-MM-YYYY dates
+    if str(values[0])[4:5] == '-':
+        return pd.to_datetime(dates, format='ISO8601')
+    return pd.to_datetime(dates, dayfirst=True)
+
+def calendar_columns(dates):
+    """Rows x CALENDAR_COLUMNS int8 array (missing dates get dayofweek and month_edge -1)"""
+    codes, uniques = pd.factorize(dates)
+    missing = [value for value in uniques if value not in _calendar_cache]
+    if missing:
+        parsed = _parse_dates(missing).dt
+        month_edge = parsed.is_month_start.astype(int) + 2 * parsed.is_month_end.astype(int)
+        table = np.stack([parsed.dayofweek, parsed.is_month_start, parsed.is_month_end, month_edge], axis=1).astype(np.int8)
+        _calendar_cache.update(zip(missing, table))
+    # Trailing row catches factorize's -1 code for missing dates
+    table = np.array([_calendar_cache[value] for value in uniques] + [(-1, 0, 0, -1)], dtype=np.int8)
+    return table[codes]
+
+def add_calendar_columns(df):
+    """The calendar columns added to a frame with a date column (in place)"""
+    calendar = calendar_columns(df['date'])
+    for i, column in enumerate(CALENDAR_COLUMNS):
+        df[column] = calendar[:, i]
+    return df
@@ -0,0 +1,118 @@
+"""
+UIDAI Cross-Dataset Correlated Anomalies
+Finds pincodes flagged in two or three datasets on the same day
+UIDAI Data Hackathon 2026
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+DATASETS = ['enrolment', 'biometric', 'demographic']
+
+DAY_SLOTS = 100000  # Days since 1970 fit below this until the year 2243
+
+def report_days(date):
+    """Days since epoch (int64) for a report's date column"""
+    # Reports carry either ISO (YYYY-MM-DD) or DD-MM-YYYY dates; dayfirst would swap ISO month and day
+    iso = len(date) > 0 and str(date.iloc[0])[4:5] == '-'
+    dates = pd.to_datetime(date, format='ISO8601') if iso else pd.to_datetime(date, dayfirst=True)
+    return dates.to_numpy().astype('datetime64[D]').astype(np.int64)
+
+def pincode_date_key(pincode, date):
+    """Single int64 key per (pincode, day) - pincode * DAY_SLOTS + days since epoch"""
+    return pincode.to_numpy(dtype=np.int64) * DAY_SLOTS + report_days(date)
+
+def decode_key(key):
+    pincode, days = np.divmod(key, DAY_SLOTS)
+    return pincode, days.astype('datetime64[D]')
+
+def load_flagged(report_dir='anomaly_reports', suffix=''):
+    """Flagged records per dataset from the anomaly reports ({name}_anomalies{suffix}.csv)"""
+    return {name: pd.read_csv(f'{report_dir}/{name}_anomalies{suffix}.csv') for name in DATASETS
+            if os.path.exists(f'{report_dir}/{name}_anomalies{suffix}.csv')}
+
+def correlate(flagged, min_datasets=2):
+    """Ranked alerts for (pincode, date) keys flagged in at least min_datasets datasets"""
+    parts = []
+    places = []
+    for name, df in flagged.items():
+        if 'pincode' not in df.columns:
+            print(f"   ⚠️ {name}: report has no pincode column - skipped (alerts are keyed by pincode and day)")
+            continue
+        if 'is_anomaly' in df.columns:  # Full scored output - keep the flagged rows
+            df = df[df['is_anomaly'] == 1]
+        df = df.dropna(subset=['pincode'])
+        key = pincode_date_key(df['pincode'], df['date'])
+        # Score percentile within the dataset makes strengths comparable across datasets
+        per_key = pd.DataFrame({
+            'key': key,
+            'score': df['anomaly_score'].to_numpy(),
+            'strength': df['anomaly_score'].rank(pct=True).to_numpy(),
+            'total': df['total'].to_numpy()
+        }).groupby('key').agg(score=('score', 'max'), strength=('strength', 'max'), total=('total', 'sum'))
+        per_key['dataset'] = name
+        parts.append(per_key)
+        places.append(pd.DataFrame({'key': key, 'state': df['state'].to_numpy(), 'district': df['district'].to_numpy()}))
+
+    if len(parts) < min_datasets:
+        return pd.DataFrame()
+
+    # Hash count of keys across datasets - each key appears at most once per dataset
+    long = pd.concat(parts)
+    counts = long.index.value_counts()
+    hits = long[long.index.isin(counts.index[counts >= min_datasets])].reset_index()
+    if hits.empty:
+        return pd.DataFrame()
+
+    wide = hits.pivot(index='key', columns='dataset', values=['score', 'total', 'strength'])
+    wide.columns = [f'{dataset}_{value}' for value, dataset in wide.columns]
+    names = [name for name in flagged if f'{name}_score' in wide.columns]
+    alerts = wide.reset_index()
+    alerts['pincode'], alerts['date'] = decode_key(alerts['key'].to_numpy())
+    present = alerts[[f'{name}_score' for name in names]].notna()
+    alerts['n_datasets'] = present.sum(axis=1)
+    alerts['datasets'] = present.dot(pd.Index([f'{name}+' for name in names])).str.rstrip('+')
+    alerts['combined_strength'] = alerts[[f'{name}_strength' for name in names]].sum(axis=1).round(3)
+
+    place = pd.concat(places).drop_duplicates('key').set_index('key')
+    alerts = alerts.join(place, on='key')
+
+    alerts = alerts.sort_values(['n_datasets', 'combined_strength'], ascending=False, kind='stable').reset_index(drop=True)
+    alerts.insert(0, 'rank', np.arange(1, len(alerts) + 1))
+    columns = (['rank', 'date', 'pincode', 'state', 'district', 'n_datasets', 'datasets', 'combined_strength']
+               + [f'{name}_{value}' for name in names for value in ['score', 'total']])
+    return alerts[columns]
+
+def main():
+    parser = argparse.ArgumentParser(description='Cross-dataset correlated anomaly alerts')
+    parser.add_argument('--reports', default='anomaly_reports', help='Directory with the *_anomalies.csv reports')
+    parser.add_argument('--suffix', default='', help='Report file suffix, e.g. _v2 for {name}_anomalies_v2.csv')
+    parser.add_argument('--min-datasets', type=int, default=2, help='Datasets that must flag the same pincode and day')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🔗 UIDAI CORRELATED ANOMALY ALERTS")
+    print("="*60)
+
+    flagged = load_flagged(args.reports, args.suffix)
+    for name, df in flagged.items():
+        print(f"   📂 {name}: {len(df):,} flagged records")
+
+    started = time.perf_counter()
+    alerts = correlate(flagged, args.min_datasets)
+    elapsed = time.perf_counter() - started
+
+    alerts.to_csv(f'{args.reports}/correlated_alerts{args.suffix}.csv', index=False)
+    print(f"\n   ✅ {len(alerts):,} multi-signal alerts in {elapsed:.2f}s")
+    if len(alerts):
+        print(f"   ✅ Flagged in all three datasets: {(alerts['n_datasets'] == 3).sum():,}")
+        print("\n" + alerts.head(10)[['rank', 'date', 'pincode', 'district', 'datasets', 'combined_strength']].to_string(index=False))
+    print(f"\n   ✅ Saved: {args.reports}/correlated_alerts{args.suffix}.csv")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+UIDAI Anomaly Incidents
+Rolls flagged records up into district x day and district x week incidents
+UIDAI Data Hackathon 2026
+
+Flagged records are sorted by district and period once; a sweep over the sorted
+rows opens a new incident wherever the district changes or the gap to the previous
+flagged period is more than MAX_GAP, so runs of neighbouring days become one row.
+"""
+
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import warnings
+warnings.filterwarnings('ignore')
+
+from correlated_alerts import load_flagged, report_days
+
+LEVELS = ['day', 'week']
+MAX_GAP = 1  # Flagged periods at most this many days / weeks apart join one incident
+
+INCIDENT_COLUMNS = ['level', 'rank', 'state', 'district', 'start', 'end', 'span_days', 'periods', 'records',
+                    'n_datasets', 'datasets', 'total', 'max_score', 'combined_score']
+
+def flagged_records(flagged):
+    """Flagged records of all datasets in one frame, with a day number and a within-dataset strength"""
+    parts = []
+    for name, df in flagged.items():
+        if 'is_anomaly' in df.columns:  # Full scored output - keep the flagged rows
+            df = df[df['is_anomaly'] == 1]
+        parts.append(pd.DataFrame({
+            'state': df['state'].to_numpy(),
+            'district': df['district'].to_numpy(),
+            'day': report_days(df['date']),
+            'dataset': name,
+            'total': df['total'].to_numpy(),
+            'score': df['anomaly_score'].to_numpy(),
+            # Score percentile within the dataset - forest and robust scores are on different scales
+            'strength': df['anomaly_score'].rank(pct=True).to_numpy()
+        }))
+    return pd.concat(parts, ignore_index=True)
+
+def sweep_incidents(records, level='day', max_gap=MAX_GAP):
+    """One sort by (district, period), then a vectorized sweep that starts a new incident at each break"""
+    # Weeks start on Monday (day 0, 1970-01-01, was a Thursday)
+    period = records['day'].to_numpy() if level == 'day' else (records['day'].to_numpy() + 3) // 7
+    district = records.groupby(['state', 'district'], sort=False).ngroup().to_numpy()
+    order = np.lexsort((period, district))
+    district, period = district[order], period[order]
+
+    new = np.ones(len(order), dtype=bool)
+    new[1:] = (district[1:] != district[:-1]) | (period[1:] - period[:-1] > max_gap)
+    rows = records.iloc[order].assign(incident=np.cumsum(new) - 1, period=period)
+
+    incidents = rows.groupby('incident', sort=False).agg(
+        state=('state', 'first'), district=('district', 'first'), start=('day', 'min'), end=('day', 'max'),
+        periods=('period', 'nunique'), records=('score', 'size'), total=('total', 'sum'),
+        max_score=('score', 'max'), combined_score=('strength', 'sum'))
+
+    per_dataset = rows.groupby(['incident', 'dataset']).size().unstack(fill_value=0)
+    names = [name for name in records['dataset'].unique() if name in per_dataset.columns]
+    present = per_dataset[names] > 0
+    incidents['n_datasets'] = present.sum(axis=1)
+    incidents['datasets'] = present.dot(pd.Index([f'{name}+' for name in names])).str.rstrip('+')
+    for name in names:
+        incidents[f'{name}_records'] = per_dataset[name]
+
+    incidents['span_days'] = incidents['end'] - incidents['start'] + 1
+    incidents['start'] = incidents['start'].to_numpy().astype('datetime64[D]')
+    incidents['end'] = incidents['end'].to_numpy().astype('datetime64[D]')
+    incidents['combined_score'] = incidents['combined_score'].round(3)
+    incidents['level'] = level
+
+    incidents = incidents.sort_values(['combined_score', 'max_score'], ascending=False, kind='stable').reset_index(drop=True)
+    incidents['rank'] = np.arange(1, len(incidents) + 1)
+    return incidents[INCIDENT_COLUMNS + [f'{name}_records' for name in names]]
+
+def build_incidents(flagged, max_gap=MAX_GAP):
+    """Day- and week-level incidents stacked in one table (filter on the level column)"""
+    records = flagged_records(flagged)
+    return pd.concat([sweep_incidents(records, level, max_gap) for level in LEVELS], ignore_index=True), len(records)
+
+def main():
+    parser = argparse.ArgumentParser(description='District x day / week anomaly incidents')
+    parser.add_argument('--reports', default='anomaly_reports', help='Directory with the *_anomalies.csv reports')
+    parser.add_argument('--suffix', default='', help="Report name suffix, e.g. '_v2' for the master_analysis reports")
+    parser.add_argument('--max-gap', type=int, default=MAX_GAP, help='Largest gap (days / weeks) inside one incident')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("🧯 UIDAI ANOMALY INCIDENTS")
+    print("="*60)
+
+    flagged = load_flagged(args.reports, args.suffix)
+    for name, df in flagged.items():
+        print(f"   📂 {name}: {len(df):,} flagged records")
+
+    started = time.perf_counter()
+    incidents, n_records = build_incidents(flagged, args.max_gap)
+    elapsed = time.perf_counter() - started
+
+    out_path = f'{args.reports}/incidents{args.suffix}.csv'
+    incidents.to_csv(out_path, index=False)
+    for level in LEVELS:
+        table = incidents[incidents['level'] == level]
+        print(f"\n   ✅ District x {level}: {n_records:,} records -> {len(table):,} incidents "
+              f"({n_records / max(len(table), 1):.1f} records per incident)")
+        print(table.head(5)[['rank', 'state', 'district', 'start', 'end', 'records', 'datasets', 'combined_score']].to_string(index=False))
+    print(f"\n   ✅ Built in {elapsed:.2f}s")
+    print(f"   ✅ Saved: {out_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+UIDAI Anomaly Model Store
+Versioned scaler / Isolation Forest artifacts, refit-free batch scoring and
+subsample-fit / chunk-scored runs for data too large to hold in memory
+UIDAI Data Hackathon 2026
+
+Layout:
+    {root}/{dataset}/v001/scaler.joblib      fitted StandardScaler
+    {root}/{dataset}/v001/forest.joblib      fitted IsolationForest
+    {root}/{dataset}/v001/reference.joblib   statistics the features are measured against
+    {root}/{dataset}/v001/meta.json          features, contamination, row count, versions
+    {root}/{dataset}/LATEST                  name of the newest version
+Artifacts are stored uncompressed so joblib can memory-map their arrays on load.
+"""
+
+import datetime
+import json
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from scipy import sparse
+from sklearn.ensemble import IsolationForest
+from sklearn.preprocessing import StandardScaler
+
+try:
+    from . import quantile_sketch, running_stats
+except ImportError:  # Imported as a script-local module from inside ml_models/
+    import quantile_sketch
+    import running_stats
+
+MODEL_DIR = 'trained_models/anomaly'
+
+ARTIFACTS = ['scaler', 'forest', 'reference']
+
+def list_versions(name, root=MODEL_DIR):
+    """Saved versions of a dataset's model, oldest first"""
+    path = os.path.join(root, name)
+    if not os.path.isdir(path):
+        return []
+    return sorted(v for v in os.listdir(path) if v.startswith('v') and v[1:].isdigit())
+
+def save_model(name, scaler, forest, reference, features, root=MODEL_DIR, **meta):
+    """Write a new version of a dataset's model and point LATEST at it"""
+    versions = list_versions(name, root)
+    version = f'v{int(versions[-1][1:]) + 1 if versions else 1:03d}'
+    path = os.path.join(root, name, version)
+    os.makedirs(path)
+
+    for artifact, value in zip(ARTIFACTS, [scaler, forest, reference]):
+        joblib.dump(value, os.path.join(path, f'{artifact}.joblib'))
+    meta = {
+        'dataset': name,
+        'version': version,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'features': list(features),
+        'contamination': forest.contamination,
+        'sklearn_version': sklearn.__version__,
+        **meta
+    }
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2, default=str)
+
+    # Written last - readers never see a half-saved version as LATEST
+    with open(os.path.join(root, name, 'LATEST'), 'w') as f:
+        f.write(version)
+    return version
+
+def load_model(name, version=None, root=MODEL_DIR, mmap_mode='r'):
+    """Load a saved version (default LATEST) - arrays are memory-mapped, not copied"""
+    if version is None:
+        with open(os.path.join(root, name, 'LATEST')) as f:
+            version = f.read().strip()
+    path = os.path.join(root, name, version)
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    if meta['sklearn_version'] != sklearn.__version__:
+        print(f"   ⚠️ {name} {version} was saved with scikit-learn {meta['sklearn_version']} (running {sklearn.__version__})")
+
+    model = {'meta': meta}
+    for artifact in ARTIFACTS:
+        model[artifact] = joblib.load(os.path.join(path, f'{artifact}.joblib'), mmap_mode=mmap_mode)
+    return model
+
+def decision_scores(model, X):
+    """Isolation Forest decision scores for a feature frame - no refit (< 0 means anomaly)"""
+    return model['forest'].decision_function(model['scaler'].transform(X))
+
+def path_attributions(forest, X):
+    """Per-feature share of the splits on each row's isolation path, over all trees (rows sum to 1)
+
+    Each split on a path of length h credits its feature 1/h, and a tree counts 1/h
+    overall, so the short paths that make a row anomalous dominate. Cost is one
+    decision_path per tree on the rows given - pass only the flagged rows.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    credit = np.zeros((len(X), X.shape[1]))
+    for tree, features in zip(forest.estimators_, forest.estimators_features_):
+        paths = tree.decision_path(X[:, features])
+        split = np.flatnonzero(tree.tree_.feature >= 0)
+        node_feature = sparse.csr_matrix((np.ones(len(split)), (split, features[tree.tree_.feature[split]])),
+                                         shape=(tree.tree_.node_count, X.shape[1]))
+        counts = (paths @ node_feature).toarray()  # splits on each feature along each row's path
+        depth = np.fmax(counts.sum(axis=1, keepdims=True), 1)
+        credit += counts / depth ** 2
+    return credit / np.fmax(credit.sum(axis=1, keepdims=True), 1e-12)
+
+# ============================================================
+# THRESHOLD REUSE
+# ============================================================
+
+def anomaly_threshold(score_sketch, contamination=None, threshold=None):
+    """Anomaly-score cut-off (flag when score > cut-off) - an absolute threshold as given, or the
+    (1 - contamination) quantile of the saved score distribution, so a new flag rate needs no refit"""
+    if threshold is not None:
+        return float(threshold)
+    return float(quantile_sketch.sketch_quantile(score_sketch, 1 - contamination))
+
+def flag_anomalies(anomaly_scores, score_sketch, contamination=None, threshold=None):
+    """is_anomaly (0/1) for already computed anomaly scores at a new flag rate or threshold"""
+    return (np.asarray(anomaly_scores) > anomaly_threshold(score_sketch, contamination, threshold)).astype(int)
+
+# ============================================================
+# SUBSAMPLE FIT + CHUNKED SCORING
+# ============================================================
+
+CHUNK_ROWS = 250000
+SAMPLE_ROWS = 250000
+MIN_STATE_SAMPLE = 500  # Small states still get enough rows to be represented
+
+def iter_csv_chunks(path, total_columns, chunk_rows=CHUNK_ROWS):
+    """Stream a dataset from disk in fixed-size chunks with its total column added"""
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        chunk['total'] = chunk[total_columns].sum(axis=1)
+        yield chunk
+
+def stream_reference(path, total_columns, chunk_rows=CHUNK_ROWS):
+    """Feature reference (mean, std, state / district means, total sketch) and state row counts in one pass"""
+    # Fold each chunk into the running Welford statistics - memory stays at one row per group
+    store = running_stats.empty_store()
+    for chunk in iter_csv_chunks(path, total_columns, chunk_rows):
+        store = running_stats.update_store(store, chunk)
+    return running_stats.store_reference(store), store['state']['count'].astype(np.int64)
+
+def stratified_sample(path, total_columns, state_counts, sample_rows=SAMPLE_ROWS,
+                      min_per_state=MIN_STATE_SAMPLE, chunk_rows=CHUNK_ROWS, seed=42):
+    """Per-state Bernoulli sample of a file, with inverse-rate weights back to the full population"""
+    base_rate = min(1.0, sample_rows / state_counts.sum())
+    rates = (np.maximum(state_counts * base_rate, np.minimum(state_counts, min_per_state)) / state_counts).clip(upper=1)
+
+    rng = np.random.default_rng(seed)
+    parts = []
+    for chunk in iter_csv_chunks(path, total_columns, chunk_rows):
+        row_rates = chunk['state'].map(rates).fillna(base_rate).to_numpy()
+        keep = rng.random(len(chunk)) < row_rates
+        parts.append(chunk[keep].assign(sample_weight=1 / row_rates[keep]))
+    return pd.concat(parts, ignore_index=True)
+
+def weighted_quantile(values, weights, q):
+    order = np.argsort(values)
+    cumulative = np.cumsum(weights[order])
+    return values[order][np.searchsorted(cumulative, q * cumulative[-1])]
+
+def fit_on_sample(sample, features, contamination=0.01, n_jobs=None):
+    """Fit scaler + forest on a sample; the threshold is set on the reweighted sample so the
+    flag rate matches what a fit on the full population would give. Also returns the sample's
+    anomaly scores"""
+    X = sample[features].fillna(0)
+    scaler = StandardScaler()
+    X_scaled = scaler.fit_transform(X)
+
+    forest = IsolationForest(contamination=contamination, random_state=42, n_estimators=100, n_jobs=n_jobs)
+    forest.fit(X_scaled)
+    raw = forest.score_samples(X_scaled)
+    forest.offset_ = weighted_quantile(raw, sample['sample_weight'].to_numpy(), contamination)
+    return scaler, forest, -(raw - forest.offset_)
+
+def score_csv_chunks(path, model, total_columns, make_features, out_path, columns, chunk_rows=CHUNK_ROWS, explain=None):
+    """Score a file chunk by chunk and append the flagged rows to out_path as they are found
+    (explain(hits, model) adds explanation columns to the flagged rows only)"""
+    rows = flagged = 0
+    with open(out_path, 'w', newline='') as out:
+        for i, chunk in enumerate(iter_csv_chunks(path, total_columns, chunk_rows)):
+            chunk = make_features(chunk, model['reference'])
+            scores = decision_scores(model, chunk[model['meta']['features']].fillna(0))
+            hits = chunk[scores < 0].assign(anomaly_score=-scores[scores < 0])
+            if explain is not None and len(hits):
+                hits = hits.join(explain(hits, model))
+            # Every chunk writes the same columns - a hit-free first chunk must not set a shorter header
+            hits.reindex(columns=columns).to_csv(out, header=(i == 0), index=False)
+            rows += len(chunk)
+            flagged += len(hits)
+    return rows, flagged
+
+def detect_chunked(name, path, total_columns, make_features, features, out_path, columns, root=MODEL_DIR,
+                   contamination=0.01, chunk_rows=CHUNK_ROWS, sample_rows=SAMPLE_ROWS, n_jobs=None, explain=None):
+    """Stats pass, stratified-sample fit, then chunked scoring - memory follows chunk and sample size"""
+    reference, state_counts = stream_reference(path, total_columns, chunk_rows)
+    sample = make_features(stratified_sample(path, total_columns, state_counts, sample_rows, chunk_rows=chunk_rows), reference)
+    scaler, forest, sample_scores = fit_on_sample(sample, features, contamination, n_jobs)
+    reference['score_sketch'] = quantile_sketch.build_sketch(sample_scores, weights=sample['sample_weight'])
+    version = save_model(name, scaler, forest, reference, features, root=root, rows=len(sample),
+                         population_rows=int(state_counts.sum()), mode='subsample')
+
+    rows, flagged = score_csv_chunks(path, load_model(name, version, root), total_columns, make_features,
+                                     out_path, columns, chunk_rows, explain)
+    return {'version': version, 'sample_rows': len(sample), 'rows': rows, 'flagged': flagged,
+            'rate': flagged / max(rows, 1) * 100, 'score_sketch': reference['score_sketch']}
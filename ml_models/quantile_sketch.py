@@ -0,0 +1,108 @@
+"""
+UIDAI Quantile Sketch
+Mergeable t-digest style sketch for percentiles and thresholds without a full sort
+UIDAI Data Hackathon 2026
+
+A sketch is a plain dict of numpy arrays (centroid means and weights plus min, max
+and count), so it pickles and memory-maps with the rest of the model artifacts.
+Build it from chunks, merge sketches from chunks or processes, then answer
+percentile (cdf) and threshold (quantile) lookups by interpolating the centroids.
+"""
+
+import json
+import numpy as np
+
+COMPRESSION = 500  # ~2x the centroid count; higher = more accurate, larger sketch
+BLOCK_VALUES = 65536  # Values sorted together - fixed-size blocks keep the build linear in the input
+
+def _compress(means, weights, compression):
+    """Merge sorted centroids so each covers at most one unit of the k1 scale"""
+    order = np.argsort(means, kind='stable')
+    means, weights = means[order], weights[order]
+    q = (np.cumsum(weights) - weights / 2) / weights.sum()
+    # k1 scale - centroids stay tiny near the tails and grow towards the median
+    k = compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1, 1))
+    group = np.floor(k - k[0]).astype(np.int64)
+    group = np.concatenate([[0], np.cumsum(np.diff(group) != 0)])
+    merged_weights = np.bincount(group, weights)
+    return np.bincount(group, weights * means) / merged_weights, merged_weights
+
+def build_sketch(values, compression=COMPRESSION, weights=None):
+    """Sketch of a batch of values (NaNs ignored); weights let a sample stand in for its population"""
+    values = np.asarray(values, dtype=float)
+    weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=float)
+    keep = ~np.isnan(values)
+    values, weights = values[keep], weights[keep]
+    if len(values) == 0:
+        return {'means': np.empty(0), 'weights': np.empty(0), 'min': np.nan, 'max': np.nan,
+                'count': 0, 'compression': compression}
+    # Fixed-size blocks are sorted (repeats collapse) and compressed on their own, then
+    # merged like chunk sketches - n log BLOCK_VALUES, linear in n instead of a full sort
+    blocks = []
+    for lo in range(0, len(values), BLOCK_VALUES):
+        unique, inverse = np.unique(values[lo:lo + BLOCK_VALUES], return_inverse=True)
+        blocks.append(_compress(unique, np.bincount(inverse, weights[lo:lo + BLOCK_VALUES]), compression))
+    if len(blocks) == 1:
+        means, merged = blocks[0]
+    else:
+        means, merged = _compress(np.concatenate([b[0] for b in blocks]), np.concatenate([b[1] for b in blocks]), compression)
+    return {'means': means, 'weights': merged, 'min': values.min(), 'max': values.max(),
+            'count': float(weights.sum()), 'compression': compression}
+
+def merge_sketches(*sketches):
+    """Combine sketches built on different chunks or processes"""
+    sketches = [s for s in sketches if s['count']]
+    if not sketches:
+        return build_sketch([])
+    compression = max(s['compression'] for s in sketches)
+    means, weights = _compress(np.concatenate([s['means'] for s in sketches]),
+                               np.concatenate([s['weights'] for s in sketches]), compression)
+    return {'means': means, 'weights': weights, 'min': min(s['min'] for s in sketches),
+            'max': max(s['max'] for s in sketches), 'count': sum(s['count'] for s in sketches),
+            'compression': compression}
+
+def _curve(sketch):
+    positions = (np.cumsum(sketch['weights']) - sketch['weights'] / 2) / sketch['weights'].sum()
+    return (np.concatenate([[sketch['min']], sketch['means'], [sketch['max']]]),
+            np.concatenate([[0.0], positions, [1.0]]))
+
+def sketch_cdf(sketch, x):
+    """Fraction of values <= x (0-1) for each x"""
+    values, positions = _curve(sketch)
+    return np.interp(np.asarray(x, dtype=float), values, positions)
+
+def sketch_quantile(sketch, q):
+    """Value at quantile q (0-1) - e.g. the score threshold for a contamination rate"""
+    values, positions = _curve(sketch)
+    return np.interp(q, positions, values)
+
+def save_sketch(sketch, path):
+    """Sketch as a small JSON file - readable without joblib or the model artifacts"""
+    with open(path, 'w') as f:
+        json.dump({key: value.tolist() if isinstance(value, np.ndarray) else float(value)
+                   for key, value in sketch.items()}, f)
+
+def load_sketch(path):
+    with open(path) as f:
+        sketch = json.load(f)
+    for key in ['means', 'weights']:
+        sketch[key] = np.asarray(sketch[key], dtype=float)
+    return sketch
+
+def sketch_error(sketch, values, quantiles=(0.5, 0.9, 0.99, 0.999)):
+    """Value and rank error of the sketch quantiles against the exact ones (selection, not a full sort)"""
+    values = np.asarray(values, dtype=float)
+    exact = np.quantile(values, quantiles)
+    approx = sketch_quantile(sketch, np.asarray(quantiles))
+    relative = np.abs(approx - exact) / np.fmax(np.abs(exact), 1e-12)
+    rank = np.abs(np.array([(values <= a).mean() for a in approx]) - np.asarray(quantiles))
+    return {
+        'quantiles': list(quantiles),
+        'exact': exact.tolist(),
+        'approx': approx.tolist(),
+        'relative_error': relative.tolist(),
+        'max_relative_error': float(relative.max()),
+        'rank_error': rank.tolist(),
+        'max_rank_error': float(rank.max()),
+        'centroids': len(sketch['means'])
+    }
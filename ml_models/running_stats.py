@@ -0,0 +1,118 @@
+"""
+UIDAI Running Statistics Store
+Mergeable count / mean / M2 (Welford) overall, per state, per district, per district weekday / month edge and per pincode
+UIDAI Data Hackathon 2026
+
+Each new batch is summarised on its own and folded into the stored totals with
+Chan's parallel update, so the feature reference never needs the historical rows.
+Partial stores from chunks or worker processes merge the same way.
+"""
+
+import os
+import joblib
+import numpy as np
+import pandas as pd
+
+try:
+    from . import calendar_features, quantile_sketch
+except ImportError:  # Imported as a script-local module from inside ml_models/
+    import calendar_features
+    import quantile_sketch
+
+STATS_DIR = 'trained_models/stats'
+
+LEVELS = ['state', 'district']
+DOW_LEVEL = 'district_dow'  # (district, dayofweek) - the weekday baseline of each district
+MONTH_LEVEL = 'district_month_edge'  # (district, month_edge) - the mid-month / first / last day baseline
+PINCODE_LEVEL = 'district_pincode'  # (district, pincode) - the volume the neighbour features compare
+
+def _empty_stats():
+    return pd.DataFrame({'count': [], 'mean': [], 'm2': []}, dtype=float)
+
+def group_stats(df, key=None, column='total'):
+    """count / mean / M2 of one batch, per key (or a single 'all' row)"""
+    if key is None:
+        values = df[column].to_numpy(dtype=float)
+        if len(values) == 0:
+            return _empty_stats()
+        mean = values.mean()
+        return pd.DataFrame({'count': [float(len(values))], 'mean': [mean], 'm2': [((values - mean) ** 2).sum()]},
+                            index=['all'])
+    stats = df.groupby(key)[column].agg(['count', 'mean', 'var']).astype(float)
+    stats['m2'] = stats.pop('var').fillna(0) * (stats['count'] - 1)
+    return stats
+
+def merge_stats(a, b):
+    """Chan et al. pairwise merge of two count / mean / M2 tables"""
+    # An empty table has a flat index - it cannot align with a (district, dayofweek) one
+    if a.empty or b.empty:
+        return b if a.empty else a
+    a, b = a.align(b, join='outer', fill_value=0)
+    count = a['count'] + b['count']
+    safe = count.where(count > 0, 1)
+    delta = b['mean'] - a['mean']
+    return pd.DataFrame({
+        'count': count,
+        'mean': a['mean'] + delta * b['count'] / safe,
+        'm2': a['m2'] + b['m2'] + delta ** 2 * a['count'] * b['count'] / safe
+    })
+
+def empty_store():
+    return {'overall': _empty_stats(), 'state': _empty_stats(), 'district': _empty_stats(), DOW_LEVEL: _empty_stats(),
+            MONTH_LEVEL: _empty_stats(), PINCODE_LEVEL: _empty_stats(), 'total_sketch': quantile_sketch.build_sketch([]), 'batches': 0}
+
+def build_store(df):
+    """Store holding the statistics of a single batch"""
+    store = {'overall': group_stats(df)}
+    for level in LEVELS:
+        store[level] = group_stats(df, level)
+    if set(calendar_features.CALENDAR_COLUMNS) <= set(df.columns):
+        calendar = df[['dayofweek', 'month_edge']]
+    else:
+        columns = calendar_features.calendar_columns(df['date'])
+        calendar = pd.DataFrame({'dayofweek': columns[:, 0], 'month_edge': columns[:, 3]}, index=df.index)
+    store[DOW_LEVEL] = group_stats(df.assign(dayofweek=calendar['dayofweek']), ['district', 'dayofweek'])
+    store[MONTH_LEVEL] = group_stats(df.assign(month_edge=calendar['month_edge']), ['district', 'month_edge'])
+    store[PINCODE_LEVEL] = group_stats(df, ['district', 'pincode']) if 'pincode' in df.columns else _empty_stats()
+    store['total_sketch'] = quantile_sketch.build_sketch(df['total'])
+    store['batches'] = 1
+    return store
+
+def merge_stores(a, b):
+    """Combine two stores (history + new batch, or partials from parallel workers)"""
+    # Stores saved before the weekday / month edge / pincode levels existed merge as if they were empty
+    merged = {key: merge_stats(a.get(key, _empty_stats()), b.get(key, _empty_stats()))
+              for key in ['overall'] + LEVELS + [DOW_LEVEL, MONTH_LEVEL, PINCODE_LEVEL]}
+    merged['total_sketch'] = quantile_sketch.merge_sketches(a['total_sketch'], b['total_sketch'])
+    merged['batches'] = a['batches'] + b['batches']
+    return merged
+
+def update_store(store, df):
+    """Fold a new batch into the store - touches only the batch rows"""
+    return merge_stores(store, build_store(df))
+
+def store_reference(store):
+    """Feature reference (mean, std, state / district / pincode means, total sketch) from the running statistics"""
+    overall = store['overall'].iloc[0]
+    return {
+        'mean': overall['mean'],
+        'std': np.sqrt(overall['m2'] / max(overall['count'] - 1, 1)),
+        'state_means': store['state']['mean'],
+        'district_means': store['district']['mean'],
+        'district_dow_means': store.get(DOW_LEVEL, _empty_stats())['mean'],
+        'district_month_edge_means': store.get(MONTH_LEVEL, _empty_stats())['mean'],
+        'pincode_means': store.get(PINCODE_LEVEL, _empty_stats())['mean'],
+        'total_sketch': store['total_sketch']
+    }
+
+def save_store(store, name, root=STATS_DIR):
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, f'{name}.joblib')
+    joblib.dump(store, path + '.tmp')
+    os.replace(path + '.tmp', path)  # Never leave a half-written store behind
+    return path
+
+def load_store(name, root=STATS_DIR):
+    """Saved store for a dataset, or an empty one if none has been saved yet"""
+    path = os.path.join(root, f'{name}.joblib')
+    return joblib.load(path) if os.path.exists(path) else empty_store()